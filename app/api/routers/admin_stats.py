@@ -8,8 +8,6 @@ API для статистики и просмотра ответов (для а
 """
 from datetime import datetime, timedelta
 from typing import Annotated, Any
-import hashlib
-import secrets
 import csv
 import io
 import logging
@@ -18,8 +16,10 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from sqlalchemy.orm import undefer_group
 from pydantic import BaseModel, Field
 
+from app.core.security import hash_password_async, password_needs_rehash, verify_password_async
 from config import settings
 from db.session import get_db
 from db.models import (
@@ -266,6 +266,8 @@ async def get_faculty_responses(
             StageTemplate.stage_type == StageType.QUESTIONNAIRE,
             StageTemplate.is_active == True
         )
+        .order_by(StageTemplate.version.desc())
+        .limit(1)
     )
     template = result.scalars().first()
     questions = template.questions if template else []
@@ -277,6 +279,7 @@ async def get_faculty_responses(
         ).where(
             Questionnaire.faculty_id == faculty_id
         ).order_by(Questionnaire.submitted_at.desc())
+        .options(undefer_group('payload'))
     )
     rows = result.all()
     
@@ -424,22 +427,6 @@ async def check_admin_access(
         }
 
 
-def hash_password(password: str) -> str:
-    """Хеширование пароля"""
-    return hashlib.sha256(password.encode()).hexdigest()
-
-
-def verify_password(password: str, password_hash: str) -> bool:
-    """Проверка пароля"""
-    return hash_password(password) == password_hash
-
-
-def generate_password(length: int = 12) -> str:
-    """Генерация случайного пароля"""
-    alphabet = "abcdefghijkmnpqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789"
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
-
-
 def format_answer_for_export(question: dict, answer_value: Any) -> str:
     """Форматировать ответ для экспорта (читаемый формат)"""
     if answer_value is None or answer_value == '':
@@ -500,12 +487,17 @@ async def admin_login(
             error="Пароль не установлен. Обратитесь к суперадмину."
         )
     
-    if not verify_password(data.password, admin.password_hash):
+    if not await verify_password_async(data.password, admin.password_hash):
         return AdminLoginResponse(
             success=False,
             error="Неверный пароль"
         )
     
+    # Переводим старые хеши на актуальный алгоритм
+    if password_needs_rehash(admin.password_hash):
+        admin.password_hash = await hash_password_async(data.password)
+        await db.commit()
+    
     # Получаем факультет
     result = await db.execute(
         select(Faculty).where(Faculty.id == admin.faculty_id)
@@ -1,10 +1,12 @@
 """
 API для работы с Google Sheets (экспорт анкет).
 """
+import asyncio
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import undefer_group
 from pydantic import BaseModel, Field
 
 from db.session import get_db
@@ -89,8 +91,6 @@ async def set_sheet_url(
     return SetSheetUrlResponse(
         success=True,
         message="Ссылка на Google таблицу успешно сохранена",
-        # После commit() объект может быть "expired", и доступ к атрибутам
-        # вызовет ленивую подзагрузку (в async это может упасть MissingGreenlet).
         sheet_url=data.sheet_url
     )
 
@@ -166,6 +166,8 @@ async def export_questionnaires(
             StageTemplate.stage_type == StageType.QUESTIONNAIRE,
             StageTemplate.is_active == True
         )
+        .order_by(StageTemplate.version.desc())
+        .limit(1)
     )
     template = result.scalars().first()
     if not template:
@@ -183,6 +185,7 @@ async def export_questionnaires(
         ).where(
             Questionnaire.faculty_id == faculty_id
         ).order_by(Questionnaire.submitted_at.desc())
+        .options(undefer_group('payload'))
     )
     rows = result.all()
     
@@ -221,12 +224,19 @@ async def export_questionnaires(
             'answers': questionnaire.answers,
         })
     
+    sheet_url = faculty.google_sheet_url
+    faculty_name = faculty.name
+    # Экспорт в Google идёт долго: соединение возвращаем в пул до сетевого вызова,
+    # а сам синхронный клиент уводим в поток, чтобы не блокировать event loop
+    await db.close()
+    
     # Экспортируем
-    export_result = google_sheets_service.export_questionnaires(
-        sheet_url=faculty.google_sheet_url,
+    export_result = await asyncio.to_thread(
+        google_sheets_service.export_questionnaires,
+        sheet_url=sheet_url,
         questionnaires=questionnaires_data,
         questions=questions,
-        faculty_name=faculty.name,
+        faculty_name=faculty_name,
         force_export_all=data.force_export_all
     )
     
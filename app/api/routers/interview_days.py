@@ -17,12 +17,12 @@ from typing import Annotated, Optional, List
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from config import settings
 from db.session import get_db
 from db.models import (
     Faculty, Administrator, InterviewDay, TimeSlot, TimeSlotAvailability,
-    Interview
 )
 # Функции проверки прав (копируем из interview_slots)
 async def verify_head_admin(
@@ -332,13 +332,9 @@ async def delete_interview_day(
     
     admin = await verify_head_admin(day.faculty_id, telegram_id, db)
     
-    # Проверяем, есть ли записи
+    # Проверяем, есть ли записи (счётчики слотов поддерживает триггер на interviews)
     result = await db.execute(
-        select(func.count(Interview.id)).where(
-            Interview.time_slot_id.in_(
-                select(TimeSlot.id).where(TimeSlot.day_id == day_id)
-            )
-        )
+        select(func.sum(TimeSlot.current_participants)).where(TimeSlot.day_id == day_id)
     )
     current_participants = result.scalar() or 0
     
@@ -446,25 +442,15 @@ async def set_time_slot_availability(
             detail="Нельзя изменять доступность для прошедших дней"
         )
     
-    # Проверяем, существует ли уже запись
+    # Создаём запись; если уже отмечено — конфликт по uq_time_slot_interviewer, ничего не вставляется
     result = await db.execute(
-        select(TimeSlotAvailability).where(
-            TimeSlotAvailability.time_slot_id == time_slot_id,
-            TimeSlotAvailability.interviewer_id == admin.id
-        )
+        pg_insert(TimeSlotAvailability)
+        .values(time_slot_id=time_slot_id, interviewer_id=admin.id)
+        .on_conflict_do_nothing(constraint="uq_time_slot_interviewer")
+        .returning(TimeSlotAvailability.id)
     )
-    existing = result.scalar_one_or_none()
-    
-    if existing:
-        # Уже отмечено
+    if result.scalar_one_or_none() is None:
         return {"message": "Доступность уже отмечена"}
-    
-    # Создаём запись
-    availability = TimeSlotAvailability(
-        time_slot_id=time_slot_id,
-        interviewer_id=admin.id
-    )
-    db.add(availability)
     await db.commit()
     
     return {"message": "Доступность отмечена"}
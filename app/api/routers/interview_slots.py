@@ -16,6 +16,7 @@ from typing import Annotated, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from config import settings
 from db.session import get_db
@@ -443,45 +444,30 @@ async def set_availability(
             detail="Нельзя изменять доступность для прошедших слотов"
         )
     
-    # Проверяем, существует ли уже запись о доступности
+    # Создаём или обновляем отметку одним запросом (uq_slot_interviewer)
     result = await db.execute(
-        select(SlotAvailability).where(
-            SlotAvailability.slot_id == slot_id,
-            SlotAvailability.interviewer_id == admin.id
-        )
-    )
-    existing = result.scalars().first()
-    
-    if existing:
-        # Обновляем существующую запись
-        existing.available = available
-        existing.updated_at = datetime.utcnow()
-        await db.commit()
-        await db.refresh(existing)
-        
-        return AvailabilityResponse(
-            slot_id=existing.slot_id,
-            available=existing.available,
-            interviewer_id=existing.interviewer_id,
-            updated_at=existing.updated_at
+        pg_insert(SlotAvailability)
+        .values(slot_id=slot_id, interviewer_id=admin.id, available=available)
+        .on_conflict_do_update(
+            constraint="uq_slot_interviewer",
+            set_={"available": available, "updated_at": func.now()},
         )
-    else:
-        # Создаём новую запись
-        availability = SlotAvailability(
-            slot_id=slot_id,
-            interviewer_id=admin.id,
-            available=available
-        )
-        db.add(availability)
-        await db.commit()
-        await db.refresh(availability)
-        
-        return AvailabilityResponse(
-            slot_id=availability.slot_id,
-            available=availability.available,
-            interviewer_id=availability.interviewer_id,
-            updated_at=availability.updated_at
+        .returning(
+            SlotAvailability.slot_id,
+            SlotAvailability.available,
+            SlotAvailability.interviewer_id,
+            SlotAvailability.updated_at,
         )
+    )
+    row = result.one()
+    await db.commit()
+    
+    return AvailabilityResponse(
+        slot_id=row.slot_id,
+        available=row.available,
+        interviewer_id=row.interviewer_id,
+        updated_at=row.updated_at
+    )
 
 
 @router.delete("/{slot_id}/availability", status_code=status.HTTP_204_NO_CONTENT)
@@ -14,9 +14,11 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 import redis.asyncio as redis
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from config import settings
 from db.session import get_db
+from db.repositories import QuestionnaireRepository, UserRepository
 from db.models import (
     User, Faculty, StageTemplate, Questionnaire, 
     UserProgress, ApprovalQueue, StageType, StageStatus, 
@@ -24,6 +26,8 @@ from db.models import (
 )
 from app.core.redis import get_redis
 from app.services.draft_service import DraftService
+from app.services.template_cache import CachedTemplate, TemplateCache
+from app.services.user_cache import CachedUser
 from app.services.notification_service import notification_service
 from app.api.schemas.questionnaire import (
     TemplateResponse, Question, DraftSaveRequest, DraftResponse,
@@ -59,34 +63,33 @@ TelegramId = Annotated[int, Depends(get_telegram_id)]
 async def get_or_create_user(
     telegram_id: int,
     faculty_id: int,
-    db: AsyncSession
-) -> User:
-    """Получить пользователя по Telegram ID или создать нового"""
-    result = await db.execute(
-        select(User).where(User.telegram_id == telegram_id)
-    )
-    user = result.scalars().first()
+    db: AsyncSession,
+    redis_client: redis.Redis,
+) -> CachedUser:
+    """Получить пользователя по Telegram ID (из кэша, если есть) или создать нового"""
+    users = UserRepository(db, redis_client)
+    user = await users.get_cached_by_telegram(telegram_id)
     
     if not user:
-        # Автоматически создаём пользователя
-        user = User(
+        # Автоматически создаём пользователя (INSERT ... RETURNING, без refresh).
+        # В кэш не кладём: строка появится в БД только после commit
+        created = await users.create(
             telegram_id=telegram_id,
             # Имя возьмём из ответов анкеты при первом сабмите
             first_name="",
             faculty_id=faculty_id,
         )
-        db.add(user)
-        await db.flush()
-        await db.refresh(user)
+        user = CachedUser.from_user(created)
     
     return user
 
 
 async def get_faculty_with_template(
     faculty_id: int,
-    db: AsyncSession
-) -> tuple[Faculty, StageTemplate]:
-    """Получить факультет и активный шаблон анкеты"""
+    db: AsyncSession,
+    redis_client: redis.Redis,
+) -> tuple[Faculty, CachedTemplate]:
+    """Получить факультет и активный шаблон анкеты (шаблон — из кэша, если есть)"""
     # Факультет
     result = await db.execute(
         select(Faculty).where(Faculty.id == faculty_id)
@@ -98,13 +101,21 @@ async def get_faculty_with_template(
             detail="Факультет не найден"
         )
     
-    # Активный шаблон анкеты
+    # Активный шаблон анкеты: меняется только из редактора вопросов, поэтому кэшируется.
+    # Факультет не кэшируем — от него зависит, открыт ли этап
+    template_cache = TemplateCache(redis_client)
+    cached = await template_cache.get(faculty_id)
+    if cached is not None:
+        return faculty, cached
+    
     result = await db.execute(
         select(StageTemplate).where(
             StageTemplate.faculty_id == faculty_id,
             StageTemplate.stage_type == StageType.QUESTIONNAIRE,
             StageTemplate.is_active == True
         )
+        .order_by(StageTemplate.version.desc())
+        .limit(1)
     )
     template = result.scalars().first()
     if not template:
@@ -113,10 +124,10 @@ async def get_faculty_with_template(
             detail="Шаблон анкеты не найден. Администратор ещё не создал вопросы."
         )
     
-    return faculty, template
+    return faculty, await template_cache.set(faculty_id, template)
 
 
-def template_to_response(faculty: Faculty, template: StageTemplate) -> TemplateResponse:
+def template_to_response(faculty: Faculty, template: CachedTemplate) -> TemplateResponse:
     """Конвертировать модель в ответ API"""
     questions = [
         Question(
@@ -156,8 +167,8 @@ async def get_questionnaire_form(
     
     Вызывается при открытии Mini App.
     """
-    faculty, template = await get_faculty_with_template(faculty_id, db)
-    user = await get_or_create_user(telegram_id, faculty_id, db)
+    faculty, template = await get_faculty_with_template(faculty_id, db, redis_client)
+    user = await get_or_create_user(telegram_id, faculty_id, db, redis_client)
     
     # Проверяем, отправлял ли уже анкету
     result = await db.execute(
@@ -231,18 +242,19 @@ async def save_draft(
     
     Вызывается при каждом изменении ответов (с debounce на фронте).
     """
-    user = await get_or_create_user(telegram_id, faculty_id, db)
+    user = await get_or_create_user(telegram_id, faculty_id, db, redis_client)
     
-    # Проверяем что шаблон существует
-    result = await db.execute(
-        select(StageTemplate).where(StageTemplate.id == data.template_id)
-    )
-    template = result.scalars().first()
-    if not template or template.faculty_id != faculty_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Неверный template_id"
+    # Проверяем что шаблон существует (обычно это активный шаблон — он в кэше)
+    cached = await TemplateCache(redis_client).get(faculty_id)
+    if cached is None or cached.id != data.template_id:
+        result = await db.execute(
+            select(StageTemplate.faculty_id).where(StageTemplate.id == data.template_id)
         )
+        if result.scalar_one_or_none() != faculty_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Неверный template_id"
+            )
     
     draft_service = DraftService(redis_client)
     await draft_service.save_draft(
@@ -261,7 +273,7 @@ async def delete_draft(
     redis_client: redis.Redis = Depends(get_redis),
 ):
     """Удалить черновик анкеты."""
-    user = await get_or_create_user(telegram_id, faculty_id, db)
+    user = await get_or_create_user(telegram_id, faculty_id, db, redis_client)
     
     draft_service = DraftService(redis_client)
     await draft_service.delete_draft(telegram_id, faculty_id)
@@ -283,8 +295,8 @@ async def submit_questionnaire(
     3. Сохраняем в PostgreSQL (Questionnaire + ApprovalQueue + UserProgress)
     4. Удаляем черновик из Redis
     """
-    faculty, template = await get_faculty_with_template(faculty_id, db)
-    user = await get_or_create_user(telegram_id, faculty_id, db)
+    faculty, template = await get_faculty_with_template(faculty_id, db, redis_client)
+    user = await get_or_create_user(telegram_id, faculty_id, db, redis_client)
     
     # Проверяем что этап открыт
     if faculty.current_stage != StageType.QUESTIONNAIRE:
@@ -329,13 +341,12 @@ async def submit_questionnaire(
         )
     
     # Создаём анкету
-    questionnaire = Questionnaire(
+    questionnaire = await QuestionnaireRepository(db).create(
         user_id=user.id,
         faculty_id=faculty_id,
         template_id=template.id,
         answers=data.answers,
     )
-    db.add(questionnaire)
     
     # Добавляем в очередь на проверку
     approval = ApprovalQueue(
@@ -348,32 +359,26 @@ async def submit_questionnaire(
     db.add(approval)
     
     # Обновляем прогресс пользователя
-    result = await db.execute(
-        select(UserProgress).where(
-            UserProgress.user_id == user.id,
-            UserProgress.faculty_id == faculty_id,
-            UserProgress.stage_type == StageType.QUESTIONNAIRE,
-        )
-    )
-    progress = result.scalars().first()
-    if progress:
-        progress.status = SubmissionStatus.SUBMITTED
-        progress.submitted_at = datetime.utcnow()
-    else:
-        progress = UserProgress(
+    now = datetime.utcnow()
+    await db.execute(
+        pg_insert(UserProgress)
+        .values(
             user_id=user.id,
             faculty_id=faculty_id,
             stage_type=StageType.QUESTIONNAIRE,
             status=SubmissionStatus.SUBMITTED,
-            submitted_at=datetime.utcnow(),
+            submitted_at=now,
+        )
+        .on_conflict_do_update(
+            constraint="uq_user_progress_user_stage",
+            set_={"faculty_id": faculty_id, "status": SubmissionStatus.SUBMITTED, "submitted_at": now},
         )
-        db.add(progress)
+    )
     
-    # Сохраняем имя факультета до commit (чтобы избежать lazy loading после commit)
     faculty_name = faculty.name
     
+    # id анкеты пришёл из RETURNING, объекты после commit не сбрасываются
     await db.commit()
-    await db.refresh(questionnaire)
     
     # Удаляем черновик из Redis
     draft_service = DraftService(redis_client)
@@ -400,7 +405,7 @@ async def get_questionnaire_status(
     redis_client: redis.Redis = Depends(get_redis),
 ):
     """Получить статус анкеты пользователя."""
-    user = await get_or_create_user(telegram_id, faculty_id, db)
+    user = await get_or_create_user(telegram_id, faculty_id, db, redis_client)
     
     # Факультет
     result = await db.execute(
@@ -507,6 +512,8 @@ async def seed_dev_data(
             StageTemplate.stage_type == StageType.QUESTIONNAIRE,
             StageTemplate.is_active == True,
         )
+        .order_by(StageTemplate.version.desc())
+        .limit(1)
     )
     template = result.scalars().first()
     
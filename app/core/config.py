@@ -1,4 +1,4 @@
 # Реэкспорт из корневого config для обратной совместимости
-from config import settings, Settings
+from config import settings, Settings, get_settings
 
-__all__ = ["settings", "Settings"]
+__all__ = ["settings", "Settings", "get_settings"]
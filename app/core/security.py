@@ -0,0 +1,72 @@
+"""
+Пароли администраторов для входа в веб-админку.
+
+Новые пароли хешируются Argon2id. Старые записи (sha256 hex) продолжают
+проверяться и перехешируются при следующем успешном входе.
+
+Argon2 намеренно нагружает CPU (десятки миллисекунд на хеш), поэтому из async-кода
+хешировать и проверять пароли нужно через *_async — они уходят в поток и не
+блокируют event loop.
+"""
+import asyncio
+import hashlib
+import hmac
+import secrets
+
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=1)
+
+PASSWORD_ALPHABET = b"abcdefghijkmnpqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+# Байты >= этого порога отбрасываются, чтобы b % len(алфавита) был равномерным
+_PASSWORD_BYTE_LIMIT = 256 - (256 % len(PASSWORD_ALPHABET))
+
+
+def generate_password(length: int = 10) -> str:
+    """Генерация случайного пароля (CSPRNG, одна выборка случайных байт на пароль)"""
+    password = bytearray()
+    while len(password) < length:
+        for byte in secrets.token_bytes(length * 2):
+            if byte < _PASSWORD_BYTE_LIMIT:
+                password.append(PASSWORD_ALPHABET[byte % len(PASSWORD_ALPHABET)])
+                if len(password) == length:
+                    break
+    return password.decode()
+
+
+def hash_password(password: str) -> str:
+    """Хеширование пароля (Argon2id)"""
+    return _password_hasher.hash(password)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password в отдельном потоке"""
+    return await asyncio.to_thread(hash_password, password)
+
+
+def _is_legacy_hash(password_hash: str) -> bool:
+    """Старый формат: sha256 hex без соли"""
+    return not password_hash.startswith("$argon2")
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """Проверка пароля"""
+    if _is_legacy_hash(password_hash):
+        legacy = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(legacy, password_hash)
+    
+    try:
+        return _password_hasher.verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    """verify_password в отдельном потоке"""
+    return await asyncio.to_thread(verify_password, password, password_hash)
+
+
+def password_needs_rehash(password_hash: str) -> bool:
+    """Нужно ли перехешировать пароль (старый формат или устаревшие параметры)"""
+    return _is_legacy_hash(password_hash) or _password_hasher.check_needs_rehash(password_hash)
@@ -1,5 +1,6 @@
+import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
@@ -7,14 +8,19 @@ from pathlib import Path
 
 from app.core.config import settings
 from app.core.redis import redis_client
+from db.engine import warm_up_pool
+from db.query_counter import count_queries
 from app.api.routers import questionnaire, admin_stats, interview_slots, interview_days, google_sheets
 
+logger = logging.getLogger(__name__)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Управление жизненным циклом приложения"""
     # Startup
     await redis_client.connect()
+    await warm_up_pool()
     yield
     # Shutdown
     await redis_client.disconnect()
@@ -34,6 +40,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# В режиме отладки — число SQL-запросов на каждый запрос API (заголовок X-Query-Count),
+# чтобы рост числа запросов (N+1) был виден сразу
+if settings.debug:
+    @app.middleware("http")
+    async def query_count_header(request: Request, call_next):
+        with count_queries() as counter:
+            response = await call_next(request)
+        response.headers["X-Query-Count"] = str(counter.count)
+        logger.debug("%s %s: %d SQL-запросов", request.method, request.url.path, counter.count)
+        return response
+
 # Подключаем роутеры (API имеет приоритет над статикой)
 app.include_router(questionnaire.router, prefix="/api/v1")
 app.include_router(admin_stats.router, prefix="/api/v1")
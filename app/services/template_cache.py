@@ -0,0 +1,77 @@
+"""
+Кэш активных шаблонов анкеты в Redis.
+
+Ключи в Redis:
+- template:questionnaire:{faculty_id} — активный шаблон анкеты факультета
+
+Шаблон читается при каждом открытии и отправке анкеты, а меняется редко:
+редактором вопросов бота и скриптами scripts/seed_questions*.py — после
+изменения ключ сбрасывается (invalidate), очистка БД в dev удаляет все ключи.
+Redis общий для API и бота, поэтому сброс виден обоим процессам.
+"""
+import json
+from dataclasses import dataclass
+
+import redis.asyncio as redis
+
+from db.models import StageTemplate, StageType
+
+TEMPLATE_CACHE_TTL = 300  # 5 минут — страховка на случай пропущенного сброса
+
+
+@dataclass(frozen=True)
+class CachedTemplate:
+    """Поля шаблона, нужные API (не ORM-объект — безопасно вне сессии)"""
+    id: int
+    stage_type: StageType
+    version: int
+    questions: list
+
+
+class TemplateCache:
+    """Кэш активного шаблона анкеты факультета"""
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis = redis_client
+
+    def _make_key(self, faculty_id: int) -> str:
+        """Формирует ключ для шаблона факультета"""
+        return f"template:questionnaire:{faculty_id}"
+
+    async def get(self, faculty_id: int) -> CachedTemplate | None:
+        """Шаблон из кэша или None"""
+        data = await self.redis.get(self._make_key(faculty_id))
+        if data is None:
+            return None
+        item = json.loads(data)
+        return CachedTemplate(
+            id=item["id"],
+            stage_type=StageType(item["stage_type"]),
+            version=item["version"],
+            questions=item["questions"],
+        )
+
+    async def set(self, faculty_id: int, template: StageTemplate) -> CachedTemplate:
+        """Положить шаблон в кэш"""
+        cached = CachedTemplate(
+            id=template.id,
+            stage_type=template.stage_type,
+            version=template.version,
+            questions=template.questions,
+        )
+        data = {
+            "id": cached.id,
+            "stage_type": cached.stage_type.value,
+            "version": cached.version,
+            "questions": cached.questions,
+        }
+        await self.redis.set(
+            self._make_key(faculty_id),
+            json.dumps(data, ensure_ascii=False),
+            ex=TEMPLATE_CACHE_TTL,
+        )
+        return cached
+
+    async def invalidate(self, faculty_id: int) -> None:
+        """Сбросить кэш шаблона (после изменения вопросов)"""
+        await self.redis.delete(self._make_key(faculty_id))
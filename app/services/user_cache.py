@@ -0,0 +1,67 @@
+"""
+Кэш пользователей по Telegram ID в Redis.
+
+Ключи в Redis:
+- user:tg:{telegram_id} — краткие данные пользователя (id, telegram_id, faculty_id)
+
+Пользователь ищется по telegram_id почти в каждом апдейте, а меняется редко —
+после изменения UserRepository.update сбрасывает ключ (invalidate) после commit.
+Читает кэш API анкеты (get_or_create_user) — один запрос на каждый вызов Mini App.
+"""
+import json
+from dataclasses import dataclass
+
+import redis.asyncio as redis
+
+from db.models import User
+
+USER_CACHE_TTL = 300  # 5 минут — страховка на случай пропущенного сброса
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """Поля пользователя для проверок доступа (не ORM-объект — безопасно вне сессии)"""
+    id: int
+    telegram_id: int
+    faculty_id: int | None
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        return cls(id=user.id, telegram_id=user.telegram_id, faculty_id=user.faculty_id)
+
+
+class UserCache:
+    """Кэш кратких данных пользователя по Telegram ID"""
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis = redis_client
+
+    def _make_key(self, telegram_id: int) -> str:
+        """Формирует ключ для пользователя"""
+        return f"user:tg:{telegram_id}"
+
+    async def get(self, telegram_id: int) -> CachedUser | None:
+        """Пользователь из кэша или None"""
+        data = await self.redis.get(self._make_key(telegram_id))
+        if data is None:
+            return None
+        return CachedUser(**json.loads(data))
+
+    async def set(self, user: User) -> CachedUser:
+        """Положить пользователя в кэш"""
+        cached = CachedUser.from_user(user)
+        data = {
+            "id": cached.id,
+            "telegram_id": cached.telegram_id,
+            "faculty_id": cached.faculty_id,
+        }
+        await self.redis.set(
+            self._make_key(cached.telegram_id),
+            json.dumps(data),
+            ex=USER_CACHE_TTL,
+        )
+        return cached
+
+    async def invalidate(self, telegram_id: int) -> None:
+        """Сбросить кэш пользователя (после изменения)"""
+        await self.redis.delete(self._make_key(telegram_id))
@@ -14,10 +14,17 @@ from aiogram import Bot, Dispatcher, Router, F
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 from aiogram.filters import Command, CommandStart
+from aiogram.fsm.storage.redis import RedisStorage
 from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, WebAppInfo
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
 
 from config import settings
 from bot.handlers import admin_router, user_router, questions_router, cleanup_router, superadmin_router, reviewers_router, broadcast_router, video_stage_router
+from bot.handlers.cleanup import close_http_session
+from bot.cache import close_redis
+from bot.middlewares import ThrottlingMiddleware, UserLockMiddleware
+from db.engine import warm_up_pool
 
 # Логирование
 logging.basicConfig(
@@ -174,8 +181,7 @@ async def callback_quest_faculty(callback: CallbackQuery):
     from db.models import Faculty, StageType, StageStatus
     
     async with async_session_maker() as db:
-        result = await db.execute(select(Faculty).where(Faculty.id == faculty_id))
-        faculty = result.scalars().first()
+        faculty = await db.get(Faculty, faculty_id)
     
     if not faculty:
         await callback.answer("Факультет не найден", show_alert=True)
@@ -225,8 +231,7 @@ async def callback_quest_closed(callback: CallbackQuery):
     from db.models import Faculty
     
     async with async_session_maker() as db:
-        result = await db.execute(select(Faculty).where(Faculty.id == faculty_id))
-        faculty = result.scalars().first()
+        faculty = await db.get(Faculty, faculty_id)
     
     if not faculty:
         await callback.answer("Факультет не найден", show_alert=True)
@@ -278,6 +283,36 @@ async def callback_quest_back(callback: CallbackQuery):
     await callback.answer()
 
 
+async def run_webhook(bot: Bot, dp: Dispatcher):
+    """Приём обновлений через webhook: Telegram сам присылает апдейты, соединения бота заняты только отправкой"""
+    async def on_startup(bot: Bot):
+        await bot.set_webhook(
+            f"{settings.bot_webhook_url.rstrip('/')}{settings.bot_webhook_path}",
+            secret_token=settings.bot_webhook_secret or None,
+            max_connections=settings.bot_webhook_max_connections,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+    
+    dp.startup.register(on_startup)
+    
+    app = web.Application()
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=settings.bot_webhook_secret or None,
+    ).register(app, path=settings.bot_webhook_path)
+    setup_application(app, dp, bot=bot)
+    
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, settings.bot_webhook_host, settings.bot_webhook_port)
+    await site.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
 async def main():
     """Запуск бота"""
     if not settings.telegram_bot_token:
@@ -290,8 +325,19 @@ async def main():
         default=DefaultBotProperties(parse_mode=ParseMode.HTML)
     )
     
-    # Диспетчер
-    dp = Dispatcher()
+    # Диспетчер: FSM в Redis, чтобы состояние переживало рестарт и было общим для нескольких процессов
+    storage = RedisStorage.from_url(
+        settings.redis_url,
+        state_ttl=settings.fsm_ttl,
+        data_ttl=settings.fsm_ttl,
+    )
+    dp = Dispatcher(storage=storage)
+    # Сообщения одного пользователя обрабатываются по очереди (пачки пересланных сообщений)
+    dp.message.outer_middleware(UserLockMiddleware())
+    # Частые повторы (кнопка загрузки видео, отправка видео) отсекаются до обращения к БД
+    throttling = ThrottlingMiddleware()
+    dp.message.middleware(throttling)
+    dp.callback_query.middleware(throttling)
     
     # Подключаем роутеры
     dp.include_router(main_router)
@@ -302,17 +348,34 @@ async def main():
     dp.include_router(admin_router)
     dp.include_router(user_router)
     dp.include_router(questions_router)
-    dp.include_router(cleanup_router)
+    if settings.is_dev:
+        dp.include_router(cleanup_router)  # Dev-команды не регистрируются в prod
+    
+    # Пул соединений к БД открываем при запуске, а не на первых апдейтах
+    dp.startup.register(warm_up_pool)
+    
+    # Закрываем общие HTTP- и Redis-клиенты и хранилище FSM при остановке
+    dp.shutdown.register(close_http_session)
+    dp.shutdown.register(close_redis)
+    dp.shutdown.register(storage.close)
     
     # Запуск
     logger.info("Бот запускается...")
     
     try:
-        await dp.start_polling(bot)
+        if settings.bot_webhook_url:
+            await run_webhook(bot, dp)
+        else:
+            await dp.start_polling(bot)
     finally:
         await bot.session.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:  # uvloop нет под Windows — работаем на стандартном цикле
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
 
@@ -0,0 +1,261 @@
+"""
+Кэши бота.
+
+- TTLCache — in-process кэш для частых lookup'ов (сбрасывается при рестарте)
+- Redis — общий кэш редко меняющихся справочников (список факультетов)
+"""
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+import redis.asyncio as redis
+from sqlalchemy import select
+
+from app.services.template_cache import TemplateCache
+from config import settings
+from db.engine import async_session_maker
+from db.models import Administrator, Faculty
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Словарь, записи которого устаревают через ttl секунд"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._data: dict[Hashable, tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Получить значение или default, если записи нет или она устарела"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._data.pop(key, None)
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Сохранить значение"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Удалить запись (после изменения данных в БД)"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Очистить кэш целиком"""
+        self._data.clear()
+
+
+# telegram_id -> AdminInfo (редактор вопросов)
+admin_cache = TTLCache(ttl=60)
+
+@dataclass(frozen=True)
+class HeadAdmin:
+    """Главный админ факультета (без ORM-объекта, чтобы безопасно хранить в кэше)"""
+    id: int
+    faculty_id: int | None
+    role: str
+
+
+# telegram_id -> HeadAdmin (управление проверяющими, видео-этап)
+head_admin_cache = TTLCache(ttl=60)
+
+
+async def get_head_admin(telegram_id: int) -> HeadAdmin | None:
+    """Главный админ факультета (из кэша, при промахе — из БД) или None"""
+    cached = head_admin_cache.get(telegram_id)
+    if cached is not None:
+        return cached
+    
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(Administrator.id, Administrator.faculty_id, Administrator.role).where(
+                Administrator.telegram_id == telegram_id,
+                Administrator.role == "head_admin",
+                Administrator.is_active == True
+            )
+        )
+        row = result.first()
+    
+    if not row:
+        return None
+    
+    admin = HeadAdmin(id=row.id, faculty_id=row.faculty_id, role=row.role)
+    head_admin_cache.set(telegram_id, admin)
+    return admin
+
+
+def invalidate_admin(telegram_id: int) -> None:
+    """Сбросить закэшированные права пользователя (после изменения администраторов)"""
+    admin_cache.invalidate(telegram_id)
+    head_admin_cache.invalidate(telegram_id)
+
+
+def clear_admin_caches() -> None:
+    """Сбросить права всех пользователей"""
+    admin_cache.clear()
+    head_admin_cache.clear()
+
+
+# faculty_id -> название факультета
+faculty_name_cache = TTLCache(ttl=60)
+
+
+async def get_faculty_name(faculty_id: int) -> str | None:
+    """Название факультета (из кэша, при промахе — из БД)"""
+    name = faculty_name_cache.get(faculty_id)
+    if name is not None:
+        return name
+    
+    async with async_session_maker() as db:
+        name = await db.scalar(select(Faculty.name).where(Faculty.id == faculty_id))
+    
+    if name is not None:
+        faculty_name_cache.set(faculty_id, name)
+    return name
+
+
+# === Redis ===
+
+_redis: redis.Redis | None = None
+
+
+def get_redis() -> redis.Redis:
+    """Общий Redis-клиент бота (создаётся при первом обращении)"""
+    global _redis
+    if _redis is None:
+        _redis = redis.from_url(settings.redis_url, decode_responses=True)
+    return _redis
+
+
+async def close_redis() -> None:
+    """Закрыть Redis-клиент (вызывается при остановке бота)"""
+    global _redis
+    if _redis is not None:
+        await _redis.close()
+    _redis = None
+
+
+# Сколько ключей удалять одной командой UNLINK
+REDIS_UNLINK_BATCH = 500
+
+
+async def unlink_pattern(redis_client: redis.Redis, pattern: str) -> int:
+    """Удалить ключи по маске: SCAN + UNLINK пачками через pipeline"""
+    deleted = 0
+    batch = []
+    
+    async def flush() -> int:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.unlink(*batch)
+        results = await pipe.execute()
+        batch.clear()
+        return sum(results)
+    
+    async for key in redis_client.scan_iter(match=pattern, count=1000):
+        batch.append(key)
+        if len(batch) >= REDIS_UNLINK_BATCH:
+            deleted += await flush()
+    
+    if batch:
+        deleted += await flush()
+    
+    return deleted
+
+
+FACULTIES_CACHE_KEY = "faculties:list:v1"
+FACULTIES_CACHE_TTL = 300  # 5 минут
+
+
+@dataclass(frozen=True)
+class CachedFaculty:
+    """Факультет для списков выбора (только то, что выводится)"""
+    id: int
+    name: str
+
+
+async def get_faculties_cached() -> list[CachedFaculty]:
+    """Список факультетов (id, name) из Redis, при промахе — из БД"""
+    try:
+        cached = await get_redis().get(FACULTIES_CACHE_KEY)
+        if cached is not None:
+            return [CachedFaculty(*item) for item in json.loads(cached)]
+    except redis.RedisError as e:
+        logger.warning(f"Redis недоступен, читаем факультеты из БД: {e}")
+    
+    async with async_session_maker() as db:
+        result = await db.execute(select(Faculty.id, Faculty.name).order_by(Faculty.id))
+        faculties = [CachedFaculty(row.id, row.name) for row in result]
+    
+    try:
+        await get_redis().set(
+            FACULTIES_CACHE_KEY,
+            json.dumps([[f.id, f.name] for f in faculties], ensure_ascii=False),
+            ex=FACULTIES_CACHE_TTL,
+        )
+    except redis.RedisError as e:
+        logger.warning(f"Не удалось закэшировать факультеты: {e}")
+    
+    return faculties
+
+
+async def invalidate_faculties_cache() -> None:
+    """Сбросить кэш списка факультетов (после создания/удаления)"""
+    faculty_name_cache.clear()
+    try:
+        await get_redis().delete(FACULTIES_CACHE_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Не удалось сбросить кэш факультетов: {e}")
+
+
+# === Отправленные видео ===
+
+# Отметка — только подсказка, чтобы не ходить в БД на повторные отправки подряд;
+# источник правды — user_progress. TTL ограничивает время, на которое отметка
+# может пережить сброс прогресса в БД (ручная правка, повторное открытие этапа)
+SUBMITTED_VIDEO_TTL = 3600  # 1 час
+
+
+def _submitted_video_key(faculty_id: int, user_id: int) -> str:
+    return f"submitted:home_video:{faculty_id}:{user_id}"
+
+
+async def is_video_submitted(faculty_id: int, user_id: int) -> bool:
+    """Отмечено ли в Redis, что пользователь уже отправил видео (при ошибке Redis — нет)"""
+    try:
+        return bool(await get_redis().exists(_submitted_video_key(faculty_id, user_id)))
+    except redis.RedisError as e:
+        logger.warning(f"Redis недоступен, проверяем отправку видео по БД: {e}")
+        return False
+
+
+async def mark_video_submitted(faculty_id: int, user_id: int) -> None:
+    """Запомнить в Redis, что пользователь отправил видео"""
+    try:
+        await get_redis().set(_submitted_video_key(faculty_id, user_id), 1, ex=SUBMITTED_VIDEO_TTL)
+    except redis.RedisError as e:
+        logger.warning(f"Не удалось отметить отправку видео в Redis: {e}")
+
+
+async def reset_videos_submitted(faculty_id: int) -> None:
+    """Сбросить отметки об отправленных видео факультета (при открытии этапа видео)"""
+    try:
+        await unlink_pattern(get_redis(), f"submitted:home_video:{faculty_id}:*")
+    except redis.RedisError as e:
+        logger.warning(f"Не удалось сбросить отметки видео факультета {faculty_id}: {e}")
+
+
+# === Шаблоны анкеты (кэш API) ===
+
+async def invalidate_template_cache(faculty_id: int) -> None:
+    """Сбросить закэшированный для Mini App шаблон анкеты (после правки вопросов)"""
+    try:
+        await TemplateCache(get_redis()).invalidate(faculty_id)
+    except redis.RedisError as e:
+        logger.warning(f"Не удалось сбросить кэш шаблона факультета {faculty_id}: {e}")
@@ -9,6 +9,7 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
+from bot.cache import reset_videos_submitted
 from config import settings
 from db.engine import async_session_maker
 from db.models import (
@@ -177,8 +178,7 @@ async def _show_faculty_stages(callback: CallbackQuery, faculty_id: int):
             return
     
     async with async_session_maker() as db:
-        result = await db.execute(select(Faculty).where(Faculty.id == faculty_id))
-        faculty = result.scalars().first()
+        faculty = await db.get(Faculty, faculty_id)
     
     if not faculty:
         await callback.answer("Факультет не найден", show_alert=True)
@@ -258,8 +258,7 @@ async def callback_set_stage(callback: CallbackQuery):
             return
     
     async with async_session_maker() as db:
-        result = await db.execute(select(Faculty).where(Faculty.id == faculty_id))
-        faculty = result.scalars().first()
+        faculty = await db.get(Faculty, faculty_id)
         
         if not faculty:
             await callback.answer("Факультет не найден", show_alert=True)
@@ -287,6 +286,10 @@ async def callback_set_stage(callback: CallbackQuery):
         
         await db.commit()
     
+    # Прогресс по видео могли поправить в БД — отметки Redis не должны его перекрывать
+    if new_stage == StageType.HOME_VIDEO and new_status == StageStatus.OPEN:
+        await reset_videos_submitted(faculty_id)
+    
     await callback.answer(f"✅ Этап изменён: {stage_type} ({stage_status})", show_alert=True)
     
     # Обновляем сообщение
@@ -306,8 +309,7 @@ async def callback_video_management(callback: CallbackQuery):
             await callback.answer("Администратор не найден", show_alert=True)
             return
         
-        result = await db.execute(select(Faculty).where(Faculty.id == admin.faculty_id))
-        faculty = result.scalars().first()
+        faculty = await db.get(Faculty, admin.faculty_id)
         
         if not faculty:
             await callback.answer("Факультет не найден", show_alert=True)
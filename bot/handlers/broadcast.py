@@ -4,34 +4,28 @@
 """
 import logging
 import asyncio
-from typing import Optional
 
 from aiogram import Router, F, Bot
-from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
+from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, MessageEntity
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from sqlalchemy import select, func
 
+from bot.cache import get_head_admin
 from db.session import async_session_maker
-from db.models import Administrator, Faculty, User, UserProgress
+from db.models import Faculty, User, UserProgress
 
 logger = logging.getLogger(__name__)
 
 broadcast_router = Router()
 
 
-async def get_head_admin(telegram_id: int) -> Optional[Administrator]:
-    """Проверить, является ли пользователь главным админом"""
-    async with async_session_maker() as db:
-        result = await db.execute(
-            select(Administrator).where(
-                Administrator.telegram_id == telegram_id,
-                Administrator.role == "head_admin",
-                Administrator.is_active == True
-            )
-        )
-        return result.scalars().first()
+def dump_entities(entities: list[MessageEntity] | None) -> list[dict] | None:
+    """Разметка сообщения в виде, пригодном для хранения в FSM (Redis хранит JSON)"""
+    if not entities:
+        return None
+    return [e.model_dump(mode="json", exclude_none=True) for e in entities]
 
 
 class BroadcastStates(StatesGroup):
@@ -55,10 +49,7 @@ async def cmd_broadcast(message: Message, state: FSMContext):
     
     # Получаем статистику по пользователям
     async with async_session_maker() as db:
-        result = await db.execute(
-            select(Faculty).where(Faculty.id == admin.faculty_id)
-        )
-        faculty = result.scalars().first()
+        faculty = await db.get(Faculty, admin.faculty_id)
         
         # Считаем пользователей с этим факультетом
         result = await db.execute(
@@ -130,7 +121,7 @@ async def process_broadcast_text(message: Message, state: FSMContext):
     await state.update_data(
         broadcast_type="text",
         broadcast_text=message.text,
-        broadcast_entities=message.entities
+        broadcast_entities=dump_entities(message.entities)
     )
     await state.set_state(BroadcastStates.confirm)
     
@@ -161,7 +152,7 @@ async def process_broadcast_photo(message: Message, state: FSMContext):
         broadcast_type="photo",
         broadcast_photo_id=message.photo[-1].file_id,  # Самое большое фото
         broadcast_caption=message.caption,
-        broadcast_entities=message.caption_entities
+        broadcast_entities=dump_entities(message.caption_entities)
     )
     await state.set_state(BroadcastStates.confirm)
     
@@ -324,10 +315,7 @@ async def callback_broadcast_filter_select(callback: CallbackQuery, state: FSMCo
     
     # Получаем количество пользователей по фильтру
     async with async_session_maker() as db:
-        result = await db.execute(
-            select(Faculty).where(Faculty.id == admin.faculty_id)
-        )
-        faculty = result.scalars().first()
+        faculty = await db.get(Faculty, admin.faculty_id)
         
         if filter_type == "all":
             result = await db.execute(
@@ -1,53 +1,137 @@
 """
 Команды очистки тестовых данных.
-Только для dev режима!
+Только для dev режима! Роутер подключается в bot.py только при ENV=dev.
 """
+import asyncio
+import aiohttp
 import redis.asyncio as redis
 from aiogram import Router
 from aiogram.filters import Command
 from aiogram.types import Message
-from sqlalchemy import text, delete
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
 
+from bot.cache import clear_admin_caches, get_redis, invalidate_faculties_cache, unlink_pattern
 from config import settings
 from db.engine import async_session_maker
-from db.models import (
-    User, Faculty, StageTemplate, Questionnaire, HomeVideo,
-    Interview, InterviewSlot, UserProgress, ApprovalQueue, AdminActionLog
-)
 
 cleanup_router = Router()
 
+# Таблицы с тестовыми данными. Перечислены все таблицы, ссылающиеся на faculty
+# (в т.ч. administrators — админы тоже удаляются): TRUNCATE идёт без CASCADE,
+# поэтому в отчёт попадает всё, что удаляется, а новая зависимая таблица,
+# не добавленная сюда, остановит очистку ошибкой, а не исчезнет молча
+CLEANUP_TABLES = (
+    "admin_action_logs",
+    "approval_queue",
+    "user_progress",
+    "questionnaires",
+    "home_videos",
+    "interviews",
+    "slot_availability",
+    "interview_slots",
+    "time_slot_availability",
+    "time_slots",
+    "interview_days",
+    "stage_templates",
+    "users",
+    "administrators",
+    "faculty",
+)
+
+# Ключи Redis, ссылающиеся на id из очищаемых таблиц: после RESTART IDENTITY
+# те же id получат новые записи, поэтому ключи удаляются вместе с таблицами
+DB_DERIVED_REDIS_PATTERNS = (
+    "submitted:home_video:*",
+    "template:questionnaire:*",
+    "user:tg:*",
+)
+
+# Общая HTTP-сессия бота (пул соединений и keep-alive переиспользуются между вызовами)
+_http_session: aiohttp.ClientSession | None = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Получить общую HTTP-сессию (создаётся при первом обращении)"""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=60)
+        )
+    return _http_session
+
+
+async def close_http_session() -> None:
+    """Закрыть общую HTTP-сессию (вызывается при остановке бота)"""
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+
+async def _do_cleanup_redis() -> int:
+    """Удалить черновики из Redis, вернуть количество удалённых ключей"""
+    redis_client = redis.from_url(settings.redis_url)
+    try:
+        # SCAN не блокирует Redis, в отличие от KEYS
+        return await unlink_pattern(redis_client, "draft:*")
+    finally:
+        await redis_client.close()
+
+
+async def _do_cleanup_db() -> dict[str, int]:
+    """Очистить тестовые таблицы, вернуть количество строк по таблицам"""
+    async with async_session_maker() as db:
+        # Считаем строки одним запросом (TRUNCATE не возвращает rowcount)
+        counts_query = ", ".join(
+            f"(SELECT count(*) FROM {table}) AS {table}" for table in CLEANUP_TABLES
+        )
+        result = await db.execute(text(f"SELECT {counts_query}"))
+        counts = dict(result.mappings().one())
+        
+        # Одна команда вместо поочерёдных DELETE
+        await db.execute(text(
+            f"TRUNCATE TABLE {', '.join(CLEANUP_TABLES)} RESTART IDENTITY"
+        ))
+        
+        await db.commit()
+    
+    clear_admin_caches()  # administrators тоже очищены
+    await invalidate_faculties_cache()
+    for pattern in DB_DERIVED_REDIS_PATTERNS:
+        await unlink_pattern(get_redis(), pattern)
+    return counts
+
 
-def is_dev_mode() -> bool:
-    """Проверка dev режима"""
-    return settings.is_dev
+def _format_redis_report(deleted: int) -> str:
+    """Отчёт об очистке Redis"""
+    if not deleted:
+        return "ℹ️ Redis пуст, нечего удалять"
+    return (
+        f"✅ <b>Redis очищен</b>\n\n"
+        f"Удалено ключей: {deleted}"
+    )
+
+
+def _format_db_report(counts: dict[str, int]) -> str:
+    """Отчёт об очистке БД"""
+    total = sum(counts.values())
+    if total == 0:
+        return "ℹ️ База данных пуста, нечего удалять"
+    
+    report = "\n".join([f"  • {k}: {v}" for k, v in counts.items() if v > 0])
+    return (
+        f"✅ <b>База данных очищена</b>\n\n"
+        f"Удалено записей:\n{report}\n\n"
+        f"<b>Всего: {total}</b>"
+    )
 
 
 @cleanup_router.message(Command("cleanup_redis"))
 async def cmd_cleanup_redis(message: Message):
     """Очистить все данные в Redis"""
-    if not is_dev_mode():
-        await message.answer("⛔ Команда доступна только в dev режиме")
-        return
-    
     try:
-        redis_client = redis.from_url(settings.redis_url)
-        
-        # Получаем все ключи с черновиками
-        keys = await redis_client.keys("draft:*")
-        
-        if keys:
-            deleted = await redis_client.delete(*keys)
-            await message.answer(
-                f"✅ <b>Redis очищен</b>\n\n"
-                f"Удалено ключей: {deleted}",
-            )
-        else:
-            await message.answer("ℹ️ Redis пуст, нечего удалять")
-        
-        await redis_client.close()
-        
+        deleted = await _do_cleanup_redis()
+        await message.answer(_format_redis_report(deleted))
     except Exception as e:
         await message.answer(f"❌ Ошибка: {e}")
 
@@ -55,70 +139,9 @@ async def cmd_cleanup_redis(message: Message):
 @cleanup_router.message(Command("cleanup_db"))
 async def cmd_cleanup_db(message: Message):
     """Очистить тестовые данные в PostgreSQL"""
-    if not is_dev_mode():
-        await message.answer("⛔ Команда доступна только в dev режиме")
-        return
-    
     try:
-        async with async_session_maker() as db:
-            # Удаляем в правильном порядке (учитываем FK)
-            counts = {}
-            
-            # 1. Удаляем логи
-            result = await db.execute(delete(AdminActionLog))
-            counts["admin_action_logs"] = result.rowcount
-            
-            # 2. Удаляем очередь проверки
-            result = await db.execute(delete(ApprovalQueue))
-            counts["approval_queue"] = result.rowcount
-            
-            # 3. Удаляем прогресс
-            result = await db.execute(delete(UserProgress))
-            counts["user_progress"] = result.rowcount
-            
-            # 4. Удаляем анкеты
-            result = await db.execute(delete(Questionnaire))
-            counts["questionnaires"] = result.rowcount
-            
-            # 5. Удаляем видео
-            result = await db.execute(delete(HomeVideo))
-            counts["home_videos"] = result.rowcount
-            
-            # 6. Удаляем интервью
-            result = await db.execute(delete(Interview))
-            counts["interviews"] = result.rowcount
-            
-            # 7. Удаляем слоты
-            result = await db.execute(delete(InterviewSlot))
-            counts["interview_slots"] = result.rowcount
-            
-            # 8. Удаляем шаблоны
-            result = await db.execute(delete(StageTemplate))
-            counts["stage_templates"] = result.rowcount
-            
-            # 9. Удаляем пользователей
-            result = await db.execute(delete(User))
-            counts["users"] = result.rowcount
-            
-            # 10. Удаляем факультеты
-            result = await db.execute(delete(Faculty))
-            counts["faculty"] = result.rowcount
-            
-            await db.commit()
-            
-            # Формируем отчёт
-            total = sum(counts.values())
-            report = "\n".join([f"  • {k}: {v}" for k, v in counts.items() if v > 0])
-            
-            if total > 0:
-                await message.answer(
-                    f"✅ <b>База данных очищена</b>\n\n"
-                    f"Удалено записей:\n{report}\n\n"
-                    f"<b>Всего: {total}</b>"
-                )
-            else:
-                await message.answer("ℹ️ База данных пуста, нечего удалять")
-                
+        counts = await _do_cleanup_db()
+        await message.answer(_format_db_report(counts))
     except Exception as e:
         await message.answer(f"❌ Ошибка: {e}")
 
@@ -126,44 +149,40 @@ async def cmd_cleanup_db(message: Message):
 @cleanup_router.message(Command("cleanup_all"))
 async def cmd_cleanup_all(message: Message):
     """Очистить всё (Redis + PostgreSQL)"""
-    if not is_dev_mode():
-        await message.answer("⛔ Команда доступна только в dev режиме")
-        return
-    
     await message.answer("🧹 Начинаю полную очистку...")
     
-    # Очищаем Redis
-    await cmd_cleanup_redis(message)
-    
-    # Очищаем БД
-    await cmd_cleanup_db(message)
+    # Redis и PostgreSQL независимы — чистим параллельно
+    redis_result, db_result = await asyncio.gather(
+        _do_cleanup_redis(), _do_cleanup_db(), return_exceptions=True
+    )
     
-    await message.answer("✅ <b>Полная очистка завершена!</b>")
+    parts = [
+        f"❌ Redis: {redis_result}" if isinstance(redis_result, Exception)
+        else _format_redis_report(redis_result),
+        f"❌ БД: {db_result}" if isinstance(db_result, Exception)
+        else _format_db_report(db_result),
+        "✅ <b>Полная очистка завершена!</b>",
+    ]
+    await message.answer("\n\n".join(parts))
 
 
 @cleanup_router.message(Command("seed"))
 async def cmd_seed(message: Message):
     """Создать тестовые данные"""
-    if not is_dev_mode():
-        await message.answer("⛔ Команда доступна только в dev режиме")
-        return
-    
     try:
-        import aiohttp
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.post("http://localhost:8000/api/v1/questionnaire/dev/seed") as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    await message.answer(
-                        f"✅ <b>Тестовые данные созданы</b>\n\n"
-                        f"• Faculty ID: {data['faculty_id']}\n"
-                        f"• Telegram ID: {data['user_telegram_id']}\n"
-                        f"• Template ID: {data['template_id']}"
-                    )
-                else:
-                    error = await resp.text()
-                    await message.answer(f"❌ Ошибка: {error}")
+        session = get_http_session()
+        async with session.post("http://localhost:8000/api/v1/questionnaire/dev/seed") as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                await message.answer(
+                    f"✅ <b>Тестовые данные созданы</b>\n\n"
+                    f"• Faculty ID: {data['faculty_id']}\n"
+                    f"• Telegram ID: {data['user_telegram_id']}\n"
+                    f"• Template ID: {data['template_id']}"
+                )
+            else:
+                error = await resp.text()
+                await message.answer(f"❌ Ошибка: {error}")
                     
     except aiohttp.ClientError as e:
         await message.answer(
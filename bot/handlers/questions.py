@@ -1,23 +1,32 @@
 """
 Управление вопросами анкеты через FSM.
 """
+import json
 import logging
+from dataclasses import dataclass
 from aiogram import Router, F
 from aiogram.filters import Command, StateFilter
+from aiogram.filters.callback_data import CallbackData
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
-from sqlalchemy import select
+from sqlalchemy import and_, select, text, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from sqlalchemy.orm.attributes import flag_modified
 
+from bot.cache import admin_cache, get_faculties_cached, invalidate_template_cache
 from config import settings
 from db.engine import async_session_maker
-from db.models import Faculty, StageTemplate, StageType
+from db.models import Administrator, Faculty, StageTemplate, StageType
 
 logger = logging.getLogger(__name__)
 questions_router = Router()
 
+# Отметки обязательности вопроса
+REQUIRED_MARK = "🔴"
+OPTIONAL_MARK = "⚪"
+
 
 # === FSM States ===
 class AddQuestionStates(StatesGroup):
@@ -32,49 +41,167 @@ class AddQuestionStates(StatesGroup):
     confirm = State()
 
 
+# === Callback data ===
+class QuestionsCallback(CallbackData, prefix="q"):
+    """Кнопки редактора вопросов"""
+    action: str
+    faculty_id: int | None = None
+    question_id: str | None = None
+
+
+class QuestionTypeCallback(CallbackData, prefix="qtype"):
+    """Выбор типа вопроса"""
+    kind: str
+
+
 # === Helpers ===
-async def is_admin(telegram_id: int) -> bool:
-    """Проверка админа"""
+@dataclass(frozen=True)
+class AdminInfo:
+    """Права пользователя в редакторе вопросов"""
+    is_admin: bool
+    faculty_id: int | None = None
+
+
+async def resolve_admin(telegram_id: int) -> AdminInfo:
+    """Проверка админа и его факультета — один запрос с кэшем"""
     if settings.is_dev:
-        return True
+        return AdminInfo(True, settings.dev_faculty_id)
+    
+    cached = admin_cache.get(telegram_id)
+    if cached is not None:
+        return cached
     
     async with async_session_maker() as db:
-        from db.models import Administrator
         result = await db.execute(
-            select(Administrator).where(
-                Administrator.telegram_id == telegram_id,
-                Administrator.is_active == True
+            select(Administrator.is_active, Administrator.faculty_id).where(
+                Administrator.telegram_id == telegram_id
             )
         )
-        return result.scalars().first() is not None
+        row = result.first()
+    
+    info = AdminInfo(True, row.faculty_id) if row and row.is_active else AdminInfo(False)
+    admin_cache.set(telegram_id, info)
+    return info
+
+
+async def is_admin(telegram_id: int) -> bool:
+    """Проверка админа"""
+    return (await resolve_admin(telegram_id)).is_admin
 
 
 async def get_admin_faculty_id(telegram_id: int) -> int | None:
     """Получить ID факультета админа"""
-    if settings.is_dev:
-        return settings.dev_faculty_id
-    
-    async with async_session_maker() as db:
-        from db.models import Administrator
-        result = await db.execute(
-            select(Administrator).where(
-                Administrator.telegram_id == telegram_id,
-                Administrator.is_active == True
-            )
+    return (await resolve_admin(telegram_id)).faculty_id
+
+
+def _active_questionnaire_template_clause(faculty_id):
+    """Условие выборки активного шаблона анкеты факультета"""
+    return and_(
+        StageTemplate.faculty_id == faculty_id,
+        StageTemplate.stage_type == StageType.QUESTIONNAIRE,
+        StageTemplate.is_active == True
+    )
+
+
+async def load_faculty_with_active_questionnaire_template(
+    db: AsyncSession, faculty_id: int
+) -> tuple[Faculty | None, StageTemplate | None]:
+    """Факультет и его активный шаблон анкеты одним запросом"""
+    # Тот же шаблон, что у get_active_questionnaire_template: старшая активная версия
+    active = (
+        select(StageTemplate)
+        .where(_active_questionnaire_template_clause(Faculty.id))
+        .order_by(StageTemplate.version.desc())
+        .limit(1)
+        .lateral()
+    )
+    active_template = aliased(StageTemplate, active)
+    result = await db.execute(
+        select(Faculty, active_template)
+        .outerjoin(active, true())
+        .where(Faculty.id == faculty_id)
+    )
+    row = result.first()
+    if not row:
+        return None, None
+    faculty, template = row
+    return faculty, template
+
+
+async def get_active_questionnaire_template(db: AsyncSession, faculty_id: int) -> StageTemplate | None:
+    """Активный шаблон анкеты факультета"""
+    result = await db.execute(
+        select(StageTemplate)
+        .where(_active_questionnaire_template_clause(faculty_id))
+        .order_by(StageTemplate.version.desc())
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
+async def get_active_questionnaire_questions(db: AsyncSession, faculty_id: int) -> list | None:
+    """Только список вопросов активного шаблона (без загрузки ORM-объекта)"""
+    result = await db.execute(
+        select(StageTemplate.id, StageTemplate.questions)
+        .where(_active_questionnaire_template_clause(faculty_id))
+        .order_by(StageTemplate.version.desc())
+        .limit(1)
+    )
+    row = result.first()
+    return row.questions if row else None
+
+
+def render_faculty_questions_view(
+    faculty: Faculty, template: StageTemplate | None, with_back: bool = True
+) -> tuple[str, InlineKeyboardMarkup]:
+    """Текст и клавиатура экрана вопросов факультета"""
+    if template:
+        questions = template.questions or []
+        questions_text = "".join(
+            f"\n{i}. {REQUIRED_MARK if q.get('required') else OPTIONAL_MARK} "
+            f"[{q.get('type', 'text')}] {q.get('text', '')[:50]}..."
+            for i, q in enumerate(questions, 1)
         )
-        admin = result.scalars().first()
-        return admin.faculty_id if admin else None
+    else:
+        questions_text = "\n<i>Вопросов пока нет</i>"
+    
+    buttons = [
+        [InlineKeyboardButton(text="➕ Добавить вопрос", callback_data=QuestionsCallback(action="add").pack())],
+        [InlineKeyboardButton(text="📋 Показать все", callback_data=QuestionsCallback(action="list").pack())],
+        [InlineKeyboardButton(text="🗑 Удалить вопрос", callback_data=QuestionsCallback(action="delete").pack())],
+        [InlineKeyboardButton(text="🔄 Сбросить все", callback_data=QuestionsCallback(action="reset").pack())],
+    ]
+    if with_back:
+        buttons.append([InlineKeyboardButton(text="« Назад", callback_data=QuestionsCallback(action="back").pack())])
+    
+    text = (
+        f"📝 <b>{faculty.name}</b>\n\n"
+        f"<b>Текущие вопросы:</b>{questions_text}"
+    )
+    return text, InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+# Статичные клавиатуры собираются один раз при импорте
+QUESTION_TYPES_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text="📝 Текст", callback_data=QuestionTypeCallback(kind="text").pack())],
+    [InlineKeyboardButton(text="🔘 Один вариант", callback_data=QuestionTypeCallback(kind="choice").pack())],
+    [InlineKeyboardButton(text="☑️ Несколько вариантов", callback_data=QuestionTypeCallback(kind="multiple_choice").pack())],
+    [InlineKeyboardButton(text="🔢 Число", callback_data=QuestionTypeCallback(kind="number").pack())],
+    [InlineKeyboardButton(text="❌ Отмена", callback_data=QuestionTypeCallback(kind="cancel").pack())],
+])
+
+CONFIRM_QUESTION_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [
+        InlineKeyboardButton(text="✅ Сохранить", callback_data=QuestionsCallback(action="save").pack()),
+        InlineKeyboardButton(text="❌ Отмена", callback_data=QuestionsCallback(action="cancel_add").pack()),
+    ],
+    [InlineKeyboardButton(text="🔴 Обязательный", callback_data=QuestionsCallback(action="toggle_required").pack())],
+])
 
 
 def get_question_types_keyboard():
     """Клавиатура выбора типа вопроса"""
-    return InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="📝 Текст", callback_data="qtype:text")],
-        [InlineKeyboardButton(text="🔘 Один вариант", callback_data="qtype:choice")],
-        [InlineKeyboardButton(text="☑️ Несколько вариантов", callback_data="qtype:multiple_choice")],
-        [InlineKeyboardButton(text="🔢 Число", callback_data="qtype:number")],
-        [InlineKeyboardButton(text="❌ Отмена", callback_data="qtype:cancel")],
-    ])
+    return QUESTION_TYPES_KEYBOARD
 
 
 # === Команды ===
@@ -82,65 +209,36 @@ def get_question_types_keyboard():
 @questions_router.message(Command("questions"))
 async def cmd_questions(message: Message, state: FSMContext):
     """Управление вопросами"""
-    if not await is_admin(message.from_user.id):
+    admin = await resolve_admin(message.from_user.id)
+    if not admin.is_admin:
         await message.answer("⛔ У вас нет прав администратора")
         return
     
     # Сбрасываем состояние
     await state.clear()
     
-    # Получаем факультет админа
-    admin_faculty_id = await get_admin_faculty_id(message.from_user.id)
+    # Факультет админа
+    admin_faculty_id = admin.faculty_id
     
     if admin_faculty_id:
         # Сразу показываем вопросы своего факультета
         async with async_session_maker() as db:
-            result = await db.execute(select(Faculty).where(Faculty.id == admin_faculty_id))
-            faculty = result.scalars().first()
-            
-            if not faculty:
-                await message.answer("❌ Ваш факультет не найден")
-                return
-            
-            # Получаем шаблон
-            result = await db.execute(
-                select(StageTemplate).where(
-                    StageTemplate.faculty_id == admin_faculty_id,
-                    StageTemplate.stage_type == StageType.QUESTIONNAIRE,
-                    StageTemplate.is_active == True
-                )
-            )
-            template = result.scalars().first()
+            faculty, template = await load_faculty_with_active_questionnaire_template(db, admin_faculty_id)
         
-        if template:
-            questions = template.questions or []
-            questions_text = ""
-            for i, q in enumerate(questions, 1):
-                req = "🔴" if q.get("required") else "⚪"
-                questions_text += f"\n{i}. {req} [{q.get('type', 'text')}] {q.get('text', '')[:50]}..."
-            
-            await state.update_data(template_id=template.id, faculty_id=admin_faculty_id)
-        else:
-            questions_text = "\n<i>Вопросов пока нет</i>"
-            await state.update_data(template_id=None, faculty_id=admin_faculty_id)
-        
-        buttons = [
-            [InlineKeyboardButton(text="➕ Добавить вопрос", callback_data="q:add")],
-            [InlineKeyboardButton(text="📋 Показать все", callback_data="q:list")],
-            [InlineKeyboardButton(text="🗑 Удалить вопрос", callback_data="q:delete")],
-            [InlineKeyboardButton(text="🔄 Сбросить все", callback_data="q:reset")],
-        ]
+        if not faculty:
+            await message.answer("❌ Ваш факультет не найден")
+            return
         
-        await message.answer(
-            f"📝 <b>{faculty.name}</b>\n\n"
-            f"<b>Текущие вопросы:</b>{questions_text}",
-            reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons)
+        await state.update_data(
+            template_id=template.id if template else None,
+            faculty_id=admin_faculty_id
         )
+        
+        text, keyboard = render_faculty_questions_view(faculty, template, with_back=False)
+        await message.answer(text, reply_markup=keyboard)
     else:
         # Супер-админ или нет привязки — показываем выбор
-        async with async_session_maker() as db:
-            result = await db.execute(select(Faculty))
-            faculties = result.scalars().all()
+        faculties = await get_faculties_cached()
         
         if not faculties:
             await message.answer(
@@ -154,7 +252,7 @@ async def cmd_questions(message: Message, state: FSMContext):
             buttons.append([
                 InlineKeyboardButton(
                     text=f.name,
-                    callback_data=f"q:faculty:{f.id}"
+                    callback_data=QuestionsCallback(action="faculty", faculty_id=f.id).pack()
                 )
             ])
         
@@ -165,57 +263,31 @@ async def cmd_questions(message: Message, state: FSMContext):
         )
 
 
-@questions_router.callback_query(F.data.startswith("q:faculty:"))
-async def callback_select_faculty(callback: CallbackQuery, state: FSMContext):
+@questions_router.callback_query(QuestionsCallback.filter(F.action == "faculty"))
+async def callback_select_faculty(callback: CallbackQuery, callback_data: QuestionsCallback, state: FSMContext):
     """Выбор факультета"""
-    faculty_id = int(callback.data.split(":")[2])
-    
+    await _show_faculty_questions(callback, state, callback_data.faculty_id)
+
+
+async def _show_faculty_questions(callback: CallbackQuery, state: FSMContext, faculty_id: int):
+    """Показать вопросы факультета в текущем сообщении"""
     await state.update_data(faculty_id=faculty_id)
     
     async with async_session_maker() as db:
-        # Получаем факультет
-        result = await db.execute(select(Faculty).where(Faculty.id == faculty_id))
-        faculty = result.scalars().first()
-        
-        # Получаем текущий шаблон
-        result = await db.execute(
-            select(StageTemplate).where(
-                StageTemplate.faculty_id == faculty_id,
-                StageTemplate.stage_type == StageType.QUESTIONNAIRE,
-                StageTemplate.is_active == True
-            )
-        )
-        template = result.scalars().first()
+        faculty, template = await load_faculty_with_active_questionnaire_template(db, faculty_id)
     
-    if template:
-        questions = template.questions or []
-        questions_text = ""
-        for i, q in enumerate(questions, 1):
-            req = "🔴" if q.get("required") else "⚪"
-            questions_text += f"\n{i}. {req} [{q.get('type', 'text')}] {q.get('text', '')[:50]}..."
-        
-        await state.update_data(template_id=template.id)
-    else:
-        questions_text = "\n<i>Вопросов пока нет</i>"
-        await state.update_data(template_id=None)
+    if not faculty:
+        await callback.answer("Факультет не найден", show_alert=True)
+        return
     
-    buttons = [
-        [InlineKeyboardButton(text="➕ Добавить вопрос", callback_data="q:add")],
-        [InlineKeyboardButton(text="📋 Показать все", callback_data="q:list")],
-        [InlineKeyboardButton(text="🗑 Удалить вопрос", callback_data="q:delete")],
-        [InlineKeyboardButton(text="🔄 Сбросить все", callback_data="q:reset")],
-        [InlineKeyboardButton(text="« Назад", callback_data="q:back")],
-    ]
+    await state.update_data(template_id=template.id if template else None)
     
-    await callback.message.edit_text(
-        f"📝 <b>{faculty.name}</b>\n\n"
-        f"<b>Текущие вопросы:</b>{questions_text}",
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons)
-    )
+    text, keyboard = render_faculty_questions_view(faculty, template)
+    await callback.message.edit_text(text, reply_markup=keyboard)
     await callback.answer()
 
 
-@questions_router.callback_query(F.data == "q:add")
+@questions_router.callback_query(QuestionsCallback.filter(F.action == "add"))
 async def callback_add_question(callback: CallbackQuery, state: FSMContext):
     """Начать добавление вопроса"""
     await state.set_state(AddQuestionStates.enter_question_id)
@@ -271,10 +343,10 @@ async def process_question_text(message: Message, state: FSMContext):
     )
 
 
-@questions_router.callback_query(F.data.startswith("qtype:"), AddQuestionStates.enter_question_type)
-async def process_question_type(callback: CallbackQuery, state: FSMContext):
+@questions_router.callback_query(QuestionTypeCallback.filter(), AddQuestionStates.enter_question_type)
+async def process_question_type(callback: CallbackQuery, callback_data: QuestionTypeCallback, state: FSMContext):
     """Обработка типа вопроса"""
-    qtype = callback.data.split(":")[1]
+    qtype = callback_data.kind
     
     if qtype == "cancel":
         await state.clear()
@@ -346,16 +418,8 @@ async def show_confirmation(message: Message, state: FSMContext):
     
     await state.set_state(AddQuestionStates.confirm)
     
-    buttons = [
-        [
-            InlineKeyboardButton(text="✅ Сохранить", callback_data="q:save"),
-            InlineKeyboardButton(text="❌ Отмена", callback_data="q:cancel_add"),
-        ],
-        [InlineKeyboardButton(text="🔴 Обязательный", callback_data="q:toggle_required")],
-    ]
-    
     required = data.get("required", True)
-    req_text = "🔴 Да" if required else "⚪ Нет"
+    req_text = f"{REQUIRED_MARK} Да" if required else f"{OPTIONAL_MARK} Нет"
     
     await message.answer(
         f"📝 <b>Проверьте вопрос:</b>\n\n"
@@ -365,11 +429,11 @@ async def show_confirmation(message: Message, state: FSMContext):
         f"Обязательный: {req_text}\n"
         f"Макс. длина: {data.get('max_length', '—')}"
         f"{options_text}",
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons)
+        reply_markup=CONFIRM_QUESTION_KEYBOARD
     )
 
 
-@questions_router.callback_query(F.data == "q:toggle_required", AddQuestionStates.confirm)
+@questions_router.callback_query(QuestionsCallback.filter(F.action == "toggle_required"), AddQuestionStates.confirm)
 async def toggle_required(callback: CallbackQuery, state: FSMContext):
     """Переключить обязательность"""
     data = await state.get_data()
@@ -380,11 +444,12 @@ async def toggle_required(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@questions_router.callback_query(F.data == "q:save", AddQuestionStates.confirm)
+@questions_router.callback_query(QuestionsCallback.filter(F.action == "save"), AddQuestionStates.confirm)
 async def save_question(callback: CallbackQuery, state: FSMContext):
     """Сохранить вопрос"""
     data = await state.get_data()
-    logger.info(f"Saving question with data: {data}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Saving question with data: %r", data)
     
     # Формируем вопрос
     question = {
@@ -400,30 +465,30 @@ async def save_question(callback: CallbackQuery, state: FSMContext):
     if data.get("max_length"):
         question["max_length"] = data["max_length"]
     
-    logger.info(f"Question to save: {question}")
+    logger.debug("Question to save: %r", question)
     
     async with async_session_maker() as db:
         template_id = data.get("template_id")
         faculty_id = data["faculty_id"]
-        logger.info(f"template_id={template_id}, faculty_id={faculty_id}")
+        logger.debug("template_id=%s, faculty_id=%s", template_id, faculty_id)
         
         if template_id:
-            # Обновляем существующий шаблон
-            result = await db.execute(
-                select(StageTemplate).where(StageTemplate.id == template_id)
+            # Дописываем вопрос в конец массива одним атомарным UPDATE
+            # (без чтения шаблона и без потери параллельных правок)
+            await db.execute(
+                text(
+                    "UPDATE stage_templates SET questions = "
+                    "COALESCE(questions, '[]'::jsonb) || jsonb_build_array("
+                    "CAST(:question AS jsonb) || jsonb_build_object("
+                    "'order', jsonb_array_length(COALESCE(questions, '[]'::jsonb)) + 1"
+                    ")) WHERE id = :template_id"
+                ),
+                {"question": json.dumps(question, ensure_ascii=False), "template_id": template_id}
             )
-            template = result.scalars().first()
-            logger.info(f"Found template: {template}, questions before: {template.questions if template else None}")
-            
-            questions = list(template.questions or [])  # Создаём новый список
-            question["order"] = len(questions) + 1
-            questions.append(question)
-            template.questions = questions
-            flag_modified(template, "questions")  # Явно указываем SQLAlchemy об изменении
-            logger.info(f"Questions after: {template.questions}")
+            logger.debug("Appended question to template %s", template_id)
         else:
             # Создаём новый шаблон
-            logger.info("Creating new template")
+            logger.debug("Creating new template")
             template = StageTemplate(
                 faculty_id=faculty_id,
                 stage_type=StageType.QUESTIONNAIRE,
@@ -434,7 +499,9 @@ async def save_question(callback: CallbackQuery, state: FSMContext):
             db.add(template)
         
         await db.commit()
-        logger.info("Committed to database successfully")
+        logger.info("Question %s saved for faculty %s", question["id"], faculty_id)
+    
+    await invalidate_template_cache(faculty_id)
     
     await state.clear()
     
@@ -446,7 +513,7 @@ async def save_question(callback: CallbackQuery, state: FSMContext):
     await callback.answer("Сохранено!")
 
 
-@questions_router.callback_query(F.data == "q:cancel_add")
+@questions_router.callback_query(QuestionsCallback.filter(F.action == "cancel_add"))
 async def cancel_add(callback: CallbackQuery, state: FSMContext):
     """Отменить добавление"""
     await state.clear()
@@ -454,43 +521,36 @@ async def cancel_add(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@questions_router.callback_query(F.data == "q:list")
+@questions_router.callback_query(QuestionsCallback.filter(F.action == "list"))
 async def callback_list_questions(callback: CallbackQuery, state: FSMContext):
     """Показать все вопросы"""
     data = await state.get_data()
     faculty_id = data.get("faculty_id")
     
     async with async_session_maker() as db:
-        result = await db.execute(
-            select(StageTemplate).where(
-                StageTemplate.faculty_id == faculty_id,
-                StageTemplate.stage_type == StageType.QUESTIONNAIRE,
-                StageTemplate.is_active == True
-            )
-        )
-        template = result.scalars().first()
+        questions = await get_active_questionnaire_questions(db, faculty_id)
     
-    if not template or not template.questions:
+    if not questions:
         await callback.answer("Вопросов нет", show_alert=True)
         return
     
-    text = "📋 <b>Все вопросы:</b>\n\n"
-    for i, q in enumerate(template.questions, 1):
-        req = "🔴" if q.get("required") else "⚪"
-        text += f"{i}. {req} <b>[{q.get('type')}]</b>\n"
-        text += f"   ID: <code>{q.get('id')}</code>\n"
-        text += f"   {q.get('text')}\n\n"
+    text = "📋 <b>Все вопросы:</b>\n\n" + "".join(
+        f"{i}. {REQUIRED_MARK if q.get('required') else OPTIONAL_MARK} <b>[{q.get('type')}]</b>\n"
+        f"   ID: <code>{q.get('id')}</code>\n"
+        f"   {q.get('text')}\n\n"
+        for i, q in enumerate(questions, 1)
+    )
     
     await callback.message.edit_text(
         text,
         reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="« Назад", callback_data=f"q:faculty:{faculty_id}")],
+            [InlineKeyboardButton(text="« Назад", callback_data=QuestionsCallback(action="faculty", faculty_id=faculty_id).pack())],
         ])
     )
     await callback.answer()
 
 
-@questions_router.callback_query(F.data == "q:back")
+@questions_router.callback_query(QuestionsCallback.filter(F.action == "back"))
 async def callback_back(callback: CallbackQuery, state: FSMContext):
     """Назад к списку факультетов"""
     await state.clear()
@@ -500,36 +560,28 @@ async def callback_back(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@questions_router.callback_query(F.data == "q:delete")
+@questions_router.callback_query(QuestionsCallback.filter(F.action == "delete"))
 async def callback_delete_question(callback: CallbackQuery, state: FSMContext):
     """Удалить вопрос - показать список для удаления"""
     data = await state.get_data()
     faculty_id = data.get("faculty_id")
     
     async with async_session_maker() as db:
-        result = await db.execute(
-            select(StageTemplate).where(
-                StageTemplate.faculty_id == faculty_id,
-                StageTemplate.stage_type == StageType.QUESTIONNAIRE,
-                StageTemplate.is_active == True
-            )
-        )
-        template = result.scalars().first()
+        questions = await get_active_questionnaire_questions(db, faculty_id)
     
-    if not template or not template.questions:
+    if not questions:
         await callback.answer("Вопросов нет", show_alert=True)
         return
     
     # Кнопки для каждого вопроса
-    buttons = []
-    for i, q in enumerate(template.questions):
-        buttons.append([
-            InlineKeyboardButton(
-                text=f"🗑 {i+1}. {q.get('text', '')[:30]}...",
-                callback_data=f"q:del:{q.get('id')}"
-            )
-        ])
-    buttons.append([InlineKeyboardButton(text="« Назад", callback_data=f"q:faculty:{faculty_id}")])
+    buttons = [
+        [InlineKeyboardButton(
+            text=f"🗑 {i}. {q.get('text', '')[:30]}...",
+            callback_data=QuestionsCallback(action="del", question_id=q.get("id")).pack()
+        )]
+        for i, q in enumerate(questions, 1)
+    ]
+    buttons.append([InlineKeyboardButton(text="« Назад", callback_data=QuestionsCallback(action="faculty", faculty_id=faculty_id).pack())])
     
     await callback.message.edit_text(
         "🗑 <b>Удаление вопроса</b>\n\n"
@@ -539,43 +591,45 @@ async def callback_delete_question(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@questions_router.callback_query(F.data.startswith("q:del:"))
-async def callback_confirm_delete(callback: CallbackQuery, state: FSMContext):
+@questions_router.callback_query(QuestionsCallback.filter(F.action == "del"))
+async def callback_confirm_delete(callback: CallbackQuery, callback_data: QuestionsCallback, state: FSMContext):
     """Подтвердить удаление вопроса"""
-    question_id = callback.data.split(":")[2]
+    question_id = callback_data.question_id
     data = await state.get_data()
     faculty_id = data.get("faculty_id")
+    template_id = data.get("template_id")
     
     async with async_session_maker() as db:
-        result = await db.execute(
-            select(StageTemplate).where(
-                StageTemplate.faculty_id == faculty_id,
-                StageTemplate.stage_type == StageType.QUESTIONNAIRE,
-                StageTemplate.is_active == True
-            )
-        )
-        template = result.scalars().first()
+        # ID шаблона уже известен с экрана факультета — берём по первичному ключу
+        if template_id:
+            template = await db.get(StageTemplate, template_id)
+        else:
+            template = await get_active_questionnaire_template(db, faculty_id)
         
         if template and template.questions:
-            # Удаляем вопрос из списка
-            new_questions = [q for q in template.questions if q.get("id") != question_id]
+            # Удаляем вопрос прямо в загруженном списке (без копии),
+            # об изменении JSON-колонки сообщаем через flag_modified
+            questions = template.questions
+            for index in range(len(questions) - 1, -1, -1):
+                if questions[index].get("id") == question_id:
+                    del questions[index]
             
             # Обновляем порядок
-            for i, q in enumerate(new_questions, 1):
+            for i, q in enumerate(questions, 1):
                 q["order"] = i
             
-            template.questions = new_questions
             flag_modified(template, "questions")
             await db.commit()
     
+    await invalidate_template_cache(faculty_id)
+    
     await callback.answer("✅ Вопрос удалён!", show_alert=True)
     
     # Возвращаемся к факультету
-    callback.data = f"q:faculty:{faculty_id}"
-    await callback_select_faculty(callback, state)
+    await _show_faculty_questions(callback, state, faculty_id)
 
 
-@questions_router.callback_query(F.data == "q:reset")
+@questions_router.callback_query(QuestionsCallback.filter(F.action == "reset"))
 async def callback_reset_questions(callback: CallbackQuery, state: FSMContext):
     """Сбросить все вопросы"""
     data = await state.get_data()
@@ -583,8 +637,8 @@ async def callback_reset_questions(callback: CallbackQuery, state: FSMContext):
     
     buttons = [
         [
-            InlineKeyboardButton(text="✅ Да, удалить все", callback_data="q:reset:confirm"),
-            InlineKeyboardButton(text="❌ Отмена", callback_data=f"q:faculty:{faculty_id}"),
+            InlineKeyboardButton(text="✅ Да, удалить все", callback_data=QuestionsCallback(action="reset_confirm").pack()),
+            InlineKeyboardButton(text="❌ Отмена", callback_data=QuestionsCallback(action="faculty", faculty_id=faculty_id).pack()),
         ]
     ]
     
@@ -597,32 +651,27 @@ async def callback_reset_questions(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@questions_router.callback_query(F.data == "q:reset:confirm")
+@questions_router.callback_query(QuestionsCallback.filter(F.action == "reset_confirm"))
 async def callback_reset_confirm(callback: CallbackQuery, state: FSMContext):
     """Подтвердить сброс всех вопросов"""
     data = await state.get_data()
     faculty_id = data.get("faculty_id")
     
     async with async_session_maker() as db:
-        result = await db.execute(
-            select(StageTemplate).where(
-                StageTemplate.faculty_id == faculty_id,
-                StageTemplate.stage_type == StageType.QUESTIONNAIRE,
-                StageTemplate.is_active == True
-            )
+        await db.execute(
+            update(StageTemplate)
+            .where(_active_questionnaire_template_clause(faculty_id))
+            .values(questions=[])
+            .execution_options(synchronize_session=False)
         )
-        template = result.scalars().first()
-        
-        if template:
-            template.questions = []
-            flag_modified(template, "questions")
-            await db.commit()
+        await db.commit()
+    
+    await invalidate_template_cache(faculty_id)
     
     await callback.answer("✅ Все вопросы удалены!", show_alert=True)
     
     # Возвращаемся к факультету
-    callback.data = f"q:faculty:{faculty_id}"
-    await callback_select_faculty(callback, state)
+    await _show_faculty_questions(callback, state, faculty_id)
 
 
 @questions_router.message(Command("cancel"))
@@ -2,17 +2,21 @@
 Управление проверяющими.
 Только главный админ факультета может добавлять/удалять проверяющих.
 """
+import asyncio
 import logging
-import secrets
-import hashlib
 
 from aiogram import Router, F, Bot
 from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.filters import Command
+from aiogram.filters.callback_data import CallbackData
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
-from sqlalchemy import select
+from sqlalchemy import and_, select, update
+from sqlalchemy.orm import selectinload
 
+from app.core.security import generate_password, hash_password_async
+from bot.cache import get_head_admin, invalidate_admin
+from bot.sending import call_with_retry
 from db.session import async_session_maker
 from db.models import Administrator, Faculty
 
@@ -21,28 +25,91 @@ logger = logging.getLogger(__name__)
 reviewers_router = Router()
 
 
-def generate_password(length: int = 10) -> str:
-    """Генерация случайного пароля"""
-    alphabet = "abcdefghijkmnpqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789"
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
-
-
-def hash_password(password: str) -> str:
-    """Хеширование пароля"""
-    return hashlib.sha256(password.encode()).hexdigest()
+# === Callback data ===
+class RevDelCallback(CallbackData, prefix="revdel"):
+    """Кнопка удаления проверяющего"""
+    reviewer_id: int
+
+
+# Статичные клавиатуры собираются один раз при импорте
+BACK_BUTTON = InlineKeyboardButton(text="◀️ Назад", callback_data="rev:back")
+BACK_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[[BACK_BUTTON]])
+TO_LIST_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text="◀️ К списку", callback_data="rev:back")]
+])
+CANCEL_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text="❌ Отмена", callback_data="rev:cancel")]
+])
+CONFIRM_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [
+        InlineKeyboardButton(text="✅ Добавить", callback_data="rev:confirm"),
+        InlineKeyboardButton(text="❌ Отмена", callback_data="rev:cancel")
+    ]
+])
+MENU_EMPTY_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text="➕ Добавить проверяющего", callback_data="rev:add")],
+])
+MENU_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text="➕ Добавить проверяющего", callback_data="rev:add")],
+    [InlineKeyboardButton(text="➖ Удалить проверяющего", callback_data="rev:remove")],
+])
+
+
+async def load_faculty_with_reviewers(db, faculty_id: int) -> Faculty | None:
+    """Факультет вместе с активными проверяющими (в faculty.administrators)"""
+    result = await db.execute(
+        select(Faculty)
+        .where(Faculty.id == faculty_id)
+        .options(selectinload(Faculty.administrators.and_(
+            Administrator.role == "reviewer",
+            Administrator.is_active == True
+        )))
+    )
+    return result.scalars().first()
 
 
-async def get_head_admin(telegram_id: int):
-    """Проверить, является ли пользователь главным админом"""
+async def _get_faculty_name_and_role(telegram_id: int, faculty_id: int) -> tuple[str | None, str | None]:
+    """Название факультета и роль пользователя, если он уже активный админ этого факультета"""
     async with async_session_maker() as db:
         result = await db.execute(
-            select(Administrator).where(
+            select(Faculty.name, Administrator.role)
+            .outerjoin(Administrator, and_(
+                Administrator.faculty_id == Faculty.id,
                 Administrator.telegram_id == telegram_id,
-                Administrator.role == "head_admin",
                 Administrator.is_active == True
-            )
+            ))
+            .where(Faculty.id == faculty_id)
+            .limit(1)
+        )
+        row = result.first()
+    if not row:
+        return None, None
+    return row.name, row.role
+
+
+async def _render_reviewers_list(faculty_id: int) -> tuple[str, InlineKeyboardMarkup]:
+    """Текст и клавиатура списка проверяющих факультета"""
+    async with async_session_maker() as db:
+        faculty = await load_faculty_with_reviewers(db, faculty_id)
+        reviewers = faculty.administrators
+    
+    parts = [f"👥 <b>Проверяющие факультета «{faculty.name}»</b>\n\n"]
+    
+    if reviewers:
+        parts.extend(
+            f"{i}. {r.full_name or r.username or r.telegram_id}"
+            + (f" (@{r.username})" if r.username else "")
+            + f"\n   ID: <code>{r.telegram_id}</code>\n"
+            for i, r in enumerate(reviewers, 1)
         )
-        return result.scalars().first()
+    else:
+        parts.append("<i>Пока нет проверяющих</i>\n")
+    
+    parts.append("\n<i>Проверяющие могут смотреть ответы и статистику</i>")
+    text = "".join(parts)
+    
+    keyboard = MENU_KEYBOARD if reviewers else MENU_EMPTY_KEYBOARD
+    return text, keyboard
 
 
 class AddReviewerStates(StatesGroup):
@@ -61,46 +128,8 @@ async def cmd_reviewers(message: Message):
         await message.answer("❌ Эта команда доступна только главным админам факультетов.")
         return
     
-    async with async_session_maker() as db:
-        # Получаем факультет
-        result = await db.execute(
-            select(Faculty).where(Faculty.id == admin.faculty_id)
-        )
-        faculty = result.scalars().first()
-        
-        # Получаем проверяющих этого факультета
-        result = await db.execute(
-            select(Administrator).where(
-                Administrator.faculty_id == admin.faculty_id,
-                Administrator.role == "reviewer",
-                Administrator.is_active == True
-            )
-        )
-        reviewers = result.scalars().all()
-    
-    text = f"👥 <b>Проверяющие факультета «{faculty.name}»</b>\n\n"
-    
-    if reviewers:
-        for i, r in enumerate(reviewers, 1):
-            name = r.full_name or r.username or str(r.telegram_id)
-            text += f"{i}. {name}"
-            if r.username:
-                text += f" (@{r.username})"
-            text += f"\n   ID: <code>{r.telegram_id}</code>\n"
-    else:
-        text += "<i>Пока нет проверяющих</i>\n"
-    
-    text += "\n<i>Проверяющие могут смотреть ответы и статистику</i>"
-    
-    # Кнопки
-    buttons = [
-        [InlineKeyboardButton(text="➕ Добавить проверяющего", callback_data="rev:add")],
-    ]
-    
-    if reviewers:
-        buttons.append([InlineKeyboardButton(text="➖ Удалить проверяющего", callback_data="rev:remove")])
-    
-    await message.answer(text, reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons))
+    text, keyboard = await _render_reviewers_list(admin.faculty_id)
+    await message.answer(text, reply_markup=keyboard)
 
 
 # === Добавление проверяющего ===
@@ -120,9 +149,7 @@ async def callback_add_reviewer(callback: CallbackQuery, state: FSMContext):
         "👤 <b>Добавление проверяющего</b>\n\n"
         "Отправьте Telegram ID пользователя, которого хотите добавить.\n\n"
         "<i>ID можно узнать у бота @userinfobot</i>",
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="❌ Отмена", callback_data="rev:cancel")]
-        ])
+        reply_markup=CANCEL_KEYBOARD
     )
     await callback.answer()
 
@@ -139,30 +166,28 @@ async def process_reviewer_telegram_id(message: Message, state: FSMContext, bot:
     data = await state.get_data()
     faculty_id = data["faculty_id"]
     
-    # Проверяем, не добавлен ли уже
-    async with async_session_maker() as db:
-        result = await db.execute(
-            select(Administrator).where(
-                Administrator.telegram_id == telegram_id,
-                Administrator.faculty_id == faculty_id,
-                Administrator.is_active == True
-            )
+    # Проверка дубликата в БД и запрос профиля в Telegram идут параллельно
+    lookup_task = asyncio.create_task(_get_faculty_name_and_role(telegram_id, faculty_id))
+    chat_task = asyncio.create_task(bot.get_chat(telegram_id))
+    
+    try:
+        faculty_name, existing_role = await lookup_task
+    except BaseException:
+        # Ошибка БД: запрос профиля больше не нужен, не оставляем его висеть
+        chat_task.cancel()
+        raise
+    if existing_role:
+        chat_task.cancel()
+        await message.answer(
+            f"⚠️ Этот пользователь уже является {'главным админом' if existing_role == 'head_admin' else 'проверяющим'} этого факультета.",
+            reply_markup=BACK_KEYBOARD
         )
-        existing = result.scalars().first()
-        
-        if existing:
-            await message.answer(
-                f"⚠️ Этот пользователь уже является {'главным админом' if existing.role == 'head_admin' else 'проверяющим'} этого факультета.",
-                reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-                    [InlineKeyboardButton(text="◀️ Назад", callback_data="rev:back")]
-                ])
-            )
-            await state.clear()
-            return
+        await state.clear()
+        return
     
     # Пробуем получить информацию о пользователе
     try:
-        chat = await bot.get_chat(telegram_id)
+        chat = await chat_task
         full_name = chat.full_name
         username = chat.username
     except Exception:
@@ -170,6 +195,7 @@ async def process_reviewer_telegram_id(message: Message, state: FSMContext, bot:
         username = None
     
     await state.update_data(
+        faculty_name=faculty_name,
         reviewer_telegram_id=telegram_id,
         reviewer_full_name=full_name,
         reviewer_username=username
@@ -186,12 +212,7 @@ async def process_reviewer_telegram_id(message: Message, state: FSMContext, bot:
     
     await message.answer(
         text,
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-            [
-                InlineKeyboardButton(text="✅ Добавить", callback_data="rev:confirm"),
-                InlineKeyboardButton(text="❌ Отмена", callback_data="rev:cancel")
-            ]
-        ])
+        reply_markup=CONFIRM_KEYBOARD
     )
 
 
@@ -207,19 +228,15 @@ async def confirm_add_reviewer(callback: CallbackQuery, state: FSMContext, bot:
     
     # Генерируем пароль
     password = generate_password()
-    password_hash = hash_password(password)
+    password_hash = await hash_password_async(password)
     
     reviewer_telegram_id = data["reviewer_telegram_id"]
     reviewer_username = data.get("reviewer_username")
     
+    # Название факультета сохранено в состоянии на шаге ввода ID
+    faculty_name = data.get("faculty_name") or "—"
+    
     async with async_session_maker() as db:
-        # Получаем название факультета
-        result = await db.execute(
-            select(Faculty).where(Faculty.id == data["faculty_id"])
-        )
-        faculty = result.scalars().first()
-        faculty_name = faculty.name if faculty else "—"
-        
         # Создаём проверяющего
         reviewer = Administrator(
             telegram_id=reviewer_telegram_id,
@@ -234,11 +251,13 @@ async def confirm_add_reviewer(callback: CallbackQuery, state: FSMContext, bot:
         db.add(reviewer)
         await db.commit()
     
+    invalidate_admin(reviewer_telegram_id)
     await state.clear()
     
     # Отправляем пароль проверяющему
     try:
-        await bot.send_message(
+        await call_with_retry(
+            bot.send_message,
             reviewer_telegram_id,
             f"👋 <b>Вы добавлены как проверяющий!</b>\n\n"
             f"Факультет: <b>{faculty_name}</b>\n\n"
@@ -257,25 +276,28 @@ async def confirm_add_reviewer(callback: CallbackQuery, state: FSMContext, bot:
         logger.error(f"Не удалось отправить сообщение проверяющему: {e}")
         password_sent = False
     
-    msg = f"✅ <b>Проверяющий добавлен!</b>\n\n"
-    msg += f"Telegram ID: <code>{reviewer_telegram_id}</code>\n"
+    parts = [
+        "✅ <b>Проверяющий добавлен!</b>\n\n",
+        f"Telegram ID: <code>{reviewer_telegram_id}</code>\n",
+    ]
     if reviewer_username:
-        msg += f"Username: @{reviewer_username}\n"
-    msg += f"\n"
+        parts.append(f"Username: @{reviewer_username}\n")
+    parts.append("\n")
     
     if password_sent:
-        msg += "✅ Данные для входа отправлены в личные сообщения"
+        parts.append("✅ Данные для входа отправлены в личные сообщения")
     else:
-        msg += f"⚠️ Не удалось отправить сообщение.\n"
-        msg += f"Передайте данные вручную:\n"
-        msg += f"Логин: <code>{reviewer_username or reviewer_telegram_id}</code>\n"
-        msg += f"Пароль: <code>{password}</code>"
+        parts.append(
+            f"⚠️ Не удалось отправить сообщение.\n"
+            f"Передайте данные вручную:\n"
+            f"Логин: <code>{reviewer_username or reviewer_telegram_id}</code>\n"
+            f"Пароль: <code>{password}</code>"
+        )
+    msg = "".join(parts)
     
     await callback.message.edit_text(
         msg,
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="◀️ К списку", callback_data="rev:back")]
-        ])
+        reply_markup=TO_LIST_KEYBOARD
     )
     await callback.answer("Добавлено!")
 
@@ -291,14 +313,8 @@ async def callback_remove_reviewer(callback: CallbackQuery):
         return
     
     async with async_session_maker() as db:
-        result = await db.execute(
-            select(Administrator).where(
-                Administrator.faculty_id == admin.faculty_id,
-                Administrator.role == "reviewer",
-                Administrator.is_active == True
-            )
-        )
-        reviewers = result.scalars().all()
+        faculty = await load_faculty_with_reviewers(db, admin.faculty_id)
+        reviewers = faculty.administrators if faculty else []
     
     if not reviewers:
         await callback.answer("Нет проверяющих для удаления", show_alert=True)
@@ -308,10 +324,10 @@ async def callback_remove_reviewer(callback: CallbackQuery):
     for r in reviewers:
         name = r.full_name or r.username or str(r.telegram_id)
         buttons.append([
-            InlineKeyboardButton(text=f"❌ {name}", callback_data=f"rev:del:{r.id}")
+            InlineKeyboardButton(text=f"❌ {name}", callback_data=RevDelCallback(reviewer_id=r.id).pack())
         ])
     
-    buttons.append([InlineKeyboardButton(text="◀️ Назад", callback_data="rev:back")])
+    buttons.append([BACK_BUTTON])
     
     await callback.message.edit_text(
         "🗑 <b>Удаление проверяющего</b>\n\n"
@@ -321,36 +337,41 @@ async def callback_remove_reviewer(callback: CallbackQuery):
     await callback.answer()
 
 
-@reviewers_router.callback_query(F.data.startswith("rev:del:"))
-async def confirm_remove_reviewer(callback: CallbackQuery):
+@reviewers_router.callback_query(RevDelCallback.filter())
+async def confirm_remove_reviewer(callback: CallbackQuery, callback_data: RevDelCallback):
     """Подтвердить удаление проверяющего"""
     admin = await get_head_admin(callback.from_user.id)
     if not admin:
         await callback.answer("Нет доступа", show_alert=True)
         return
     
-    reviewer_id = int(callback.data.split(":")[2])
+    reviewer_id = callback_data.reviewer_id
     
     async with async_session_maker() as db:
         result = await db.execute(
-            select(Administrator).where(Administrator.id == reviewer_id)
+            update(Administrator)
+            .where(
+                Administrator.id == reviewer_id,
+                Administrator.faculty_id == admin.faculty_id,
+                Administrator.is_active == True
+            )
+            .values(is_active=False)
+            .returning(Administrator.full_name, Administrator.username, Administrator.telegram_id)
         )
-        reviewer = result.scalars().first()
+        reviewer = result.first()
         
-        if not reviewer or reviewer.faculty_id != admin.faculty_id:
+        if not reviewer:
             await callback.answer("Проверяющий не найден", show_alert=True)
             return
         
-        reviewer.is_active = False
         await db.commit()
-        
-        name = reviewer.full_name or reviewer.username or str(reviewer.telegram_id)
+    
+    invalidate_admin(reviewer.telegram_id)
+    name = reviewer.full_name or reviewer.username or str(reviewer.telegram_id)
     
     await callback.message.edit_text(
         f"✅ Проверяющий <b>{name}</b> удалён.",
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="◀️ К списку", callback_data="rev:back")]
-        ])
+        reply_markup=TO_LIST_KEYBOARD
     )
     await callback.answer("Удалено!")
 
@@ -369,6 +390,11 @@ async def callback_cancel(callback: CallbackQuery, state: FSMContext):
 async def callback_back(callback: CallbackQuery, state: FSMContext):
     """Вернуться к списку проверяющих"""
     await state.clear()
-    # Имитируем вызов /reviewers
-    await cmd_reviewers(callback.message)
+    admin = await get_head_admin(callback.from_user.id)
+    if not admin:
+        await callback.answer("Нет доступа", show_alert=True)
+        return
+    
+    text, keyboard = await _render_reviewers_list(admin.faculty_id)
+    await callback.message.edit_text(text, reply_markup=keyboard)
     await callback.answer()
@@ -3,19 +3,28 @@
 Создание факультетов, назначение админов.
 """
 import logging
+import re
 from aiogram import Router, F, Bot
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
-from sqlalchemy import select
-
-from config import settings
+from sqlalchemy import bindparam, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+
+from app.core.security import generate_password, hash_password_async
+from bot.cache import get_faculties_cached, get_faculty_name, invalidate_admin, invalidate_faculties_cache
+from bot.middlewares import SuperAdminMiddleware
+from bot.sending import call_with_retry, edit_text_safe
 from db.engine import async_session_maker
 from db.models import Faculty, Administrator, StageType, StageStatus
 
 logger = logging.getLogger(__name__)
 superadmin_router = Router()
+# Права проверяются один раз для всех обработчиков роутера
+superadmin_router.message.middleware(SuperAdminMiddleware())
+superadmin_router.callback_query.middleware(SuperAdminMiddleware())
 
 
 # === FSM States ===
@@ -33,10 +42,59 @@ class AddAdminStates(StatesGroup):
     confirm = State()
 
 
-# === Helpers ===
-def is_super_admin(telegram_id: int) -> bool:
-    """Проверка супер-админа"""
-    return settings.is_super_admin(telegram_id)
+# === Клавиатуры ===
+# Статичные клавиатуры собираются один раз при импорте
+MAIN_MENU_TEXT = (
+    "👑 <b>Панель супер-администратора</b>\n\n"
+    "Здесь вы можете:\n"
+    "• Создавать и управлять факультетами\n"
+    "• Назначать и удалять администраторов факультетов"
+)
+MAIN_MENU_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text="🏛 Факультеты", callback_data="sa:faculties")],
+    [InlineKeyboardButton(text="👑 Админы", callback_data="sa:admins")],
+    [InlineKeyboardButton(text="➕ Создать факультет", callback_data="sa:create_faculty")],
+    [InlineKeyboardButton(text="👤 Добавить админа", callback_data="sa:add_admin")],
+])
+BACK_BUTTON = InlineKeyboardButton(text="« Назад", callback_data="sa:back")
+BACK_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[[BACK_BUTTON]])
+CONFIRM_FACULTY_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [
+        InlineKeyboardButton(text="✅ Создать", callback_data="sa:confirm_faculty"),
+        InlineKeyboardButton(text="❌ Отмена", callback_data="sa:cancel_faculty"),
+    ]
+])
+CONFIRM_ADMIN_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [
+        InlineKeyboardButton(text="✅ Добавить", callback_data="sa:confirm_admin"),
+        InlineKeyboardButton(text="❌ Отмена", callback_data="sa:cancel_admin"),
+    ]
+])
+
+
+# === Запросы ===
+# Собираются один раз при импорте; параметры передаются через bindparam
+ALL_FACULTIES_STMT = select(Faculty)
+FACULTY_DETAILS_STMT = (
+    select(Faculty)
+    .where(Faculty.id == bindparam("faculty_id"))
+    .options(selectinload(Faculty.administrators.and_(Administrator.is_active == True)))
+)
+# Только выводимые поля, название факультета — тем же запросом
+ACTIVE_ADMINS_STMT = (
+    select(
+        Administrator.id,
+        Administrator.full_name,
+        Administrator.username,
+        Administrator.telegram_id,
+        Faculty.name.label("faculty_name"),
+    )
+    .outerjoin(Faculty, Administrator.faculty_id == Faculty.id)
+    .where(Administrator.is_active == True)
+)
+
+# Управляющие символы вырезаются из пользовательского ввода
+CONTROL_CHARS_RE = re.compile(r"[\x00-\x1f\x7f]")
 
 
 # === Команды ===
@@ -44,24 +102,7 @@ def is_super_admin(telegram_id: int) -> bool:
 @superadmin_router.message(Command("superadmin"))
 async def cmd_superadmin(message: Message):
     """Панель супер-админа"""
-    if not is_super_admin(message.from_user.id):
-        await message.answer("⛔ У вас нет прав супер-администратора")
-        return
-    
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="🏛 Факультеты", callback_data="sa:faculties")],
-        [InlineKeyboardButton(text="👑 Админы", callback_data="sa:admins")],
-        [InlineKeyboardButton(text="➕ Создать факультет", callback_data="sa:create_faculty")],
-        [InlineKeyboardButton(text="👤 Добавить админа", callback_data="sa:add_admin")],
-    ])
-    
-    await message.answer(
-        "👑 <b>Панель супер-администратора</b>\n\n"
-        "Здесь вы можете:\n"
-        "• Создавать и управлять факультетами\n"
-        "• Назначать и удалять администраторов факультетов",
-        reply_markup=keyboard
-    )
+    await message.answer(MAIN_MENU_TEXT, reply_markup=MAIN_MENU_KEYBOARD)
 
 
 # === Список факультетов ===
@@ -69,80 +110,63 @@ async def cmd_superadmin(message: Message):
 @superadmin_router.callback_query(F.data == "sa:faculties")
 async def callback_faculties(callback: CallbackQuery):
     """Список всех факультетов"""
-    if not is_super_admin(callback.from_user.id):
-        await callback.answer("Нет доступа", show_alert=True)
-        return
-    
     async with async_session_maker() as db:
-        result = await db.execute(select(Faculty))
+        result = await db.execute(ALL_FACULTIES_STMT)
         faculties = result.scalars().all()
     
     if not faculties:
         text = "🏛 <b>Факультеты</b>\n\n<i>Факультетов пока нет</i>"
     else:
-        text = "🏛 <b>Факультеты</b>\n\n"
+        parts = ["🏛 <b>Факультеты</b>\n\n"]
         for f in faculties:
             stage = f.current_stage.value if f.current_stage else "не начат"
             status = f.stage_status.value if f.stage_status else "—"
-            text += f"<b>{f.id}.</b> {f.name}\n"
-            text += f"   📍 Этап: {stage} ({status})\n\n"
+            parts.append(f"<b>{f.id}.</b> {f.name}\n")
+            parts.append(f"   📍 Этап: {stage} ({status})\n\n")
+        text = "".join(parts)
     
+    # Кнопка для каждого факультета между «Создать» и «Назад»
     buttons = [
         [InlineKeyboardButton(text="➕ Создать", callback_data="sa:create_faculty")],
-        [InlineKeyboardButton(text="« Назад", callback_data="sa:back")],
+        *(
+            [InlineKeyboardButton(text=f"⚙️ {f.name}", callback_data=f"sa:faculty:{f.id}")]
+            for f in faculties
+        ),
+        [BACK_BUTTON],
     ]
     
-    # Добавляем кнопки для каждого факультета
-    for f in faculties:
-        buttons.insert(-1, [
-            InlineKeyboardButton(text=f"⚙️ {f.name}", callback_data=f"sa:faculty:{f.id}")
-        ])
-    
-    await callback.message.edit_text(
+    await edit_text_safe(
+        callback.message,
         text,
         reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons)
     )
     await callback.answer()
 
 
-@superadmin_router.callback_query(F.data.startswith("sa:faculty:"))
-async def callback_faculty_details(callback: CallbackQuery):
+async def callback_faculty_details(callback: CallbackQuery, faculty_id: int):
     """Детали факультета"""
-    if not is_super_admin(callback.from_user.id):
-        await callback.answer("Нет доступа", show_alert=True)
-        return
-    
-    faculty_id = int(callback.data.split(":")[2])
-    
     async with async_session_maker() as db:
-        result = await db.execute(
-            select(Faculty).where(Faculty.id == faculty_id)
-        )
+        # Факультет вместе с активными админами
+        result = await db.execute(FACULTY_DETAILS_STMT, {"faculty_id": faculty_id})
         faculty = result.scalars().first()
         
         if not faculty:
             await callback.answer("Факультет не найден", show_alert=True)
             return
         
-        # Получаем админов факультета
-        result = await db.execute(
-            select(Administrator).where(
-                Administrator.faculty_id == faculty_id,
-                Administrator.is_active == True
-            )
-        )
-        admins = result.scalars().all()
+        admins = faculty.administrators
     
     stage = faculty.current_stage.value if faculty.current_stage else "не начат"
     status = faculty.stage_status.value if faculty.stage_status else "—"
     
-    admins_text = ""
     if admins:
+        parts = []
         for a in admins:
-            admins_text += f"\n  • {a.full_name or 'Без имени'}"
+            parts.append(f"\n  • {a.full_name or 'Без имени'}")
             if a.username:
-                admins_text += f" (@{a.username})"
-            admins_text += f" [ID: {a.telegram_id}]"
+                parts.append(f" (@{a.username})")
+            parts.append(f" [ID: {a.telegram_id}]")
+        admins_text = "".join(parts)
     else:
         admins_text = "\n  <i>Нет админов</i>"
     
@@ -158,7 +182,8 @@ async def callback_faculty_details(callback: CallbackQuery):
         [InlineKeyboardButton(text="« Назад", callback_data="sa:faculties")],
     ]
     
-    await callback.message.edit_text(
+    await edit_text_safe(
+        callback.message,
         f"🏛 <b>{faculty.name}</b>\n\n"
         f"📝 {faculty.description or 'Без описания'}\n\n"
         f"📍 Этап: <b>{stage}</b> ({status})\n\n"
@@ -173,10 +198,6 @@ async def callback_faculty_details(callback: CallbackQuery):
 @superadmin_router.callback_query(F.data == "sa:create_faculty")
 async def callback_create_faculty(callback: CallbackQuery, state: FSMContext):
     """Начать создание факультета"""
-    if not is_super_admin(callback.from_user.id):
-        await callback.answer("Нет доступа", show_alert=True)
-        return
-    
     await state.set_state(CreateFacultyStates.enter_name)
     
     await callback.message.edit_text(
@@ -191,23 +212,17 @@ async def callback_create_faculty(callback: CallbackQuery, state: FSMContext):
 @superadmin_router.message(CreateFacultyStates.enter_name)
 async def process_faculty_name(message: Message, state: FSMContext):
     """Обработка названия факультета"""
-    if not is_super_admin(message.from_user.id):
-        return
-    
-    name = message.text.strip()
+    name = CONTROL_CHARS_RE.sub("", message.text or "").strip()
     
     if len(name) < 2 or len(name) > 100:
         await message.answer("❌ Название должно быть от 2 до 100 символов")
         return
     
-    # Проверяем уникальность
-    async with async_session_maker() as db:
-        result = await db.execute(
-            select(Faculty).where(Faculty.name == name)
-        )
-        if result.scalars().first():
-            await message.answer("❌ Факультет с таким названием уже существует")
-            return
+    # Проверяем уникальность по закэшированному списку факультетов
+    faculties = await get_faculties_cached()
+    if any(f.name == name for f in faculties):
+        await message.answer("❌ Факультет с таким названием уже существует")
+        return
     
     await state.update_data(faculty_name=name)
     await state.set_state(CreateFacultyStates.enter_description)
@@ -221,9 +236,6 @@ async def process_faculty_name(message: Message, state: FSMContext):
 @superadmin_router.message(CreateFacultyStates.enter_description)
 async def process_faculty_description(message: Message, state: FSMContext):
     """Обработка описания факультета"""
-    if not is_super_admin(message.from_user.id):
-        return
-    
     description = message.text.strip()
     if description == "-":
         description = None
@@ -233,29 +245,18 @@ async def process_faculty_description(message: Message, state: FSMContext):
     
     data = await state.get_data()
     
-    buttons = [
-        [
-            InlineKeyboardButton(text="✅ Создать", callback_data="sa:confirm_faculty"),
-            InlineKeyboardButton(text="❌ Отмена", callback_data="sa:cancel_faculty"),
-        ]
-    ]
-    
     await message.answer(
         f"📋 <b>Проверьте данные:</b>\n\n"
         f"Название: <b>{data['faculty_name']}</b>\n"
         f"Описание: {description or '—'}\n\n"
         f"Создать факультет?",
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons)
+        reply_markup=CONFIRM_FACULTY_KEYBOARD
     )
 
 
 @superadmin_router.callback_query(F.data == "sa:confirm_faculty", CreateFacultyStates.confirm)
 async def confirm_create_faculty(callback: CallbackQuery, state: FSMContext):
     """Подтвердить создание факультета"""
-    if not is_super_admin(callback.from_user.id):
-        await callback.answer("Нет доступа", show_alert=True)
-        return
-    
     data = await state.get_data()
     
     async with async_session_maker() as db:
@@ -266,10 +267,19 @@ async def confirm_create_faculty(callback: CallbackQuery, state: FSMContext):
             stage_status=StageStatus.NOT_STARTED,
         )
         db.add(faculty)
-        await db.commit()
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Кэш списка мог устареть — окончательно уникальность проверяет БД
+            await db.rollback()
+            await state.clear()
+            await callback.message.edit_text("❌ Факультет с таким названием уже существует")
+            await callback.answer()
+            return
         await db.refresh(faculty)
         faculty_id = faculty.id
     
+    await invalidate_faculties_cache()
     await state.clear()
     
     await callback.message.edit_text(
@@ -291,15 +301,8 @@ async def cancel_create_faculty(callback: CallbackQuery, state: FSMContext):
 
 # === Удаление факультета ===
 
-@superadmin_router.callback_query(F.data.startswith("sa:delete_faculty:"))
-async def callback_delete_faculty(callback: CallbackQuery):
+async def callback_delete_faculty(callback: CallbackQuery, faculty_id: int):
     """Запросить подтверждение удаления факультета"""
-    if not is_super_admin(callback.from_user.id):
-        await callback.answer("Нет доступа", show_alert=True)
-        return
-    
-    faculty_id = int(callback.data.split(":")[2])
-    
     buttons = [
         [
             InlineKeyboardButton(
@@ -323,25 +326,16 @@ async def callback_delete_faculty(callback: CallbackQuery):
     await callback.answer()
 
 
-@superadmin_router.callback_query(F.data.startswith("sa:confirm_delete_faculty:"))
-async def confirm_delete_faculty(callback: CallbackQuery):
+async def confirm_delete_faculty(callback: CallbackQuery, faculty_id: int):
     """Подтвердить удаление факультета"""
-    if not is_super_admin(callback.from_user.id):
-        await callback.answer("Нет доступа", show_alert=True)
-        return
-    
-    faculty_id = int(callback.data.split(":")[2])
-    
     async with async_session_maker() as db:
-        result = await db.execute(
-            select(Faculty).where(Faculty.id == faculty_id)
-        )
-        faculty = result.scalars().first()
+        faculty = await db.get(Faculty, faculty_id)
         
         if faculty:
             await db.delete(faculty)
             await db.commit()
     
+    await invalidate_faculties_cache()
     await callback.message.edit_text("✅ Факультет удалён")
     await callback.answer("Удалено!")
 
@@ -351,42 +345,37 @@ async def confirm_delete_faculty(callback: CallbackQuery):
 @superadmin_router.callback_query(F.data == "sa:admins")
 async def callback_admins(callback: CallbackQuery):
     """Список всех админов"""
-    if not is_super_admin(callback.from_user.id):
-        await callback.answer("Нет доступа", show_alert=True)
-        return
-    
     async with async_session_maker() as db:
-        result = await db.execute(
-            select(Administrator).where(Administrator.is_active == True)
-        )
-        admins = result.scalars().all()
+        result = await db.execute(ACTIVE_ADMINS_STMT)
+        admins = result.all()
     
     if not admins:
         text = "👑 <b>Администраторы</b>\n\n<i>Админов пока нет</i>"
     else:
-        text = "👑 <b>Администраторы</b>\n\n"
+        parts = ["👑 <b>Администраторы</b>\n\n"]
         for a in admins:
-            text += f"<b>{a.id}.</b> {a.full_name or 'Без имени'}"
+            parts.append(f"<b>{a.id}.</b> {a.full_name or 'Без имени'}")
             if a.username:
-                text += f" (@{a.username})"
-            text += f"\n   📍 {a.faculty.name if a.faculty else 'Без факультета'}"
-            text += f"\n   🆔 {a.telegram_id}\n\n"
+                parts.append(f" (@{a.username})")
+            parts.append(f"\n   📍 {a.faculty_name or 'Без факультета'}")
+            parts.append(f"\n   🆔 {a.telegram_id}\n\n")
+        text = "".join(parts)
     
+    # Кнопки для удаления каждого админа между «Добавить» и «Назад»
     buttons = [
         [InlineKeyboardButton(text="👤 Добавить админа", callback_data="sa:add_admin")],
-        [InlineKeyboardButton(text="« Назад", callback_data="sa:back")],
-    ]
-    
-    # Кнопки для удаления каждого админа
-    for a in admins:
-        buttons.insert(-1, [
-            InlineKeyboardButton(
+        *(
+            [InlineKeyboardButton(
                 text=f"🗑 {a.full_name or a.telegram_id}", 
                 callback_data=f"sa:remove_admin:{a.id}"
-            )
-        ])
+            )]
+            for a in admins
+        ),
+        [BACK_BUTTON],
+    ]
     
-    await callback.message.edit_text(
+    await edit_text_safe(
+        callback.message,
         text,
         reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons)
     )
@@ -398,35 +387,28 @@ async def callback_admins(callback: CallbackQuery):
 @superadmin_router.callback_query(F.data == "sa:add_admin")
 async def callback_add_admin(callback: CallbackQuery, state: FSMContext):
     """Начать добавление админа - выбор факультета"""
-    if not is_super_admin(callback.from_user.id):
-        await callback.answer("Нет доступа", show_alert=True)
-        return
-    
-    async with async_session_maker() as db:
-        result = await db.execute(select(Faculty))
-        faculties = result.scalars().all()
+    # Для кнопок нужны только id и название — берём закэшированный список
+    faculties = await get_faculties_cached()
     
     if not faculties:
-        await callback.message.edit_text(
+        await edit_text_safe(
+            callback.message,
             "❌ Сначала создайте факультет!",
-            reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="« Назад", callback_data="sa:back")],
-            ])
+            reply_markup=BACK_KEYBOARD
         )
         await callback.answer()
         return
     
-    buttons = []
-    for f in faculties:
-        buttons.append([
-            InlineKeyboardButton(
-                text=f.name,
-                callback_data=f"sa:add_admin_to:{f.id}"
-            )
-        ])
-    buttons.append([InlineKeyboardButton(text="« Отмена", callback_data="sa:back")])
+    buttons = [
+        *(
+            [InlineKeyboardButton(text=f.name, callback_data=f"sa:add_admin_to:{f.id}")]
+            for f in faculties
+        ),
+        [InlineKeyboardButton(text="« Отмена", callback_data="sa:back")],
+    ]
     
-    await callback.message.edit_text(
+    await edit_text_safe(
+        callback.message,
         "👤 <b>Добавление администратора</b>\n\n"
         "Выберите факультет:",
         reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons)
@@ -437,10 +419,6 @@ async def callback_add_admin(callback: CallbackQuery, state: FSMContext):
 @superadmin_router.callback_query(F.data.startswith("sa:add_admin_to:"))
 async def callback_add_admin_to_faculty(callback: CallbackQuery, state: FSMContext):
     """Выбран факультет, запросить Telegram ID"""
-    if not is_super_admin(callback.from_user.id):
-        await callback.answer("Нет доступа", show_alert=True)
-        return
-    
     faculty_id = int(callback.data.split(":")[2])
     await state.update_data(admin_faculty_id=faculty_id)
     await state.set_state(AddAdminStates.enter_telegram_id)
@@ -458,9 +436,6 @@ async def callback_add_admin_to_faculty(callback: CallbackQuery, state: FSMConte
 @superadmin_router.message(AddAdminStates.enter_telegram_id)
 async def process_admin_telegram_id(message: Message, state: FSMContext):
     """Обработка Telegram ID нового админа"""
-    if not is_super_admin(message.from_user.id):
-        return
-    
     # Проверяем, это пересланное сообщение или ID
     if message.forward_from:
         telegram_id = message.forward_from.id
@@ -480,15 +455,23 @@ async def process_admin_telegram_id(message: Message, state: FSMContext):
     # Проверяем, есть ли уже такой админ
     async with async_session_maker() as db:
         result = await db.execute(
-            select(Administrator).where(Administrator.telegram_id == telegram_id)
+            select(
+                Administrator.id,
+                Administrator.is_active,
+                Administrator.full_name,
+                Administrator.username,
+                Faculty.name.label("faculty_name"),
+            )
+            .outerjoin(Faculty, Administrator.faculty_id == Faculty.id)
+            .where(Administrator.telegram_id == telegram_id)
         )
-        existing = result.scalars().first()
+        existing = result.first()
         
         if existing:
             if existing.is_active:
                 await message.answer(
                     f"❌ Этот пользователь уже админ факультета: "
-                    f"{existing.faculty.name if existing.faculty else 'без факультета'}"
+                    f"{existing.faculty_name or 'без факультета'}"
                 )
                 return
             else:
@@ -511,74 +494,37 @@ async def process_admin_telegram_id(message: Message, state: FSMContext):
     
     data = await state.get_data()
     
-    # Получаем название факультета
-    async with async_session_maker() as db:
-        result = await db.execute(
-            select(Faculty).where(Faculty.id == data["admin_faculty_id"])
-        )
-        faculty = result.scalars().first()
-    
-    buttons = [
-        [
-            InlineKeyboardButton(text="✅ Добавить", callback_data="sa:confirm_admin"),
-            InlineKeyboardButton(text="❌ Отмена", callback_data="sa:cancel_admin"),
-        ]
-    ]
+    faculty_name = await get_faculty_name(data["admin_faculty_id"])
     
     await message.answer(
         f"📋 <b>Проверьте данные:</b>\n\n"
         f"Telegram ID: <code>{telegram_id}</code>\n"
         f"Имя: {full_name or '—'}\n"
         f"Username: @{username or '—'}\n"
-        f"Факультет: <b>{faculty.name if faculty else '—'}</b>\n\n"
+        f"Факультет: <b>{faculty_name or '—'}</b>\n\n"
         f"Добавить как администратора?",
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=buttons)
+        reply_markup=CONFIRM_ADMIN_KEYBOARD
     )
 
 
-def generate_password(length: int = 10) -> str:
-    """Генерация случайного пароля"""
-    import secrets
-    alphabet = "abcdefghijkmnpqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789"
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
-
-
-def hash_password(password: str) -> str:
-    """Хеширование пароля"""
-    import hashlib
-    return hashlib.sha256(password.encode()).hexdigest()
-
-
 @superadmin_router.callback_query(F.data == "sa:confirm_admin", AddAdminStates.confirm)
 async def confirm_add_admin(callback: CallbackQuery, state: FSMContext, bot: Bot):
     """Подтвердить добавление админа"""
-    if not is_super_admin(callback.from_user.id):
-        await callback.answer("Нет доступа", show_alert=True)
-        return
-    
     data = await state.get_data()
     
     # Генерируем пароль для админки
     password = generate_password()
-    password_hash = hash_password(password)
+    password_hash = await hash_password_async(password)
     
     admin_telegram_id = data["admin_telegram_id"]
     admin_username = data.get("admin_username")
     
+    faculty_name = await get_faculty_name(data["admin_faculty_id"]) or "—"
+    
     async with async_session_maker() as db:
-        # Получаем название факультета
-        result = await db.execute(
-            select(Faculty).where(Faculty.id == data["admin_faculty_id"])
-        )
-        faculty = result.scalars().first()
-        faculty_name = faculty.name if faculty else "—"
-        
         if data.get("admin_existing_id"):
             # Реактивируем существующего
-            result = await db.execute(
-                select(Administrator).where(Administrator.id == data["admin_existing_id"])
-            )
-            admin = result.scalars().first()
+            admin = await db.get(Administrator, data["admin_existing_id"])
             admin.is_active = True
             admin.faculty_id = data["admin_faculty_id"]
             admin.role = "head_admin"  # Суперадмин назначает главных админов
@@ -598,11 +544,13 @@ async def confirm_add_admin(callback: CallbackQuery, state: FSMContext, bot: Bot
         
         await db.commit()
     
+    invalidate_admin(admin_telegram_id)
     await state.clear()
     
     # Отправляем пароль новому админу
     try:
-        await bot.send_message(
+        await call_with_retry(
+            bot.send_message,
             admin_telegram_id,
             f"🎉 <b>Вы назначены ГЛАВНЫМ администратором!</b>\n\n"
             f"Факультет: <b>{faculty_name}</b>\n\n"
@@ -623,19 +571,24 @@ async def confirm_add_admin(callback: CallbackQuery, state: FSMContext, bot: Bot
         password_sent = False
     
     # Сообщение суперадмину
-    msg = f"✅ <b>Администратор добавлен!</b>\n\n"
-    msg += f"Telegram ID: <code>{admin_telegram_id}</code>\n"
+    parts = [
+        "✅ <b>Администратор добавлен!</b>\n\n",
+        f"Telegram ID: <code>{admin_telegram_id}</code>\n",
+    ]
     if admin_username:
-        msg += f"Username: @{admin_username}\n"
-    msg += f"Факультет: {faculty_name}\n\n"
+        parts.append(f"Username: @{admin_username}\n")
+    parts.append(f"Факультет: {faculty_name}\n\n")
     
     if password_sent:
-        msg += "✅ Пароль отправлен админу в личные сообщения"
+        parts.append("✅ Пароль отправлен админу в личные сообщения")
     else:
-        msg += f"⚠️ Не удалось отправить пароль.\n"
-        msg += f"Передайте вручную:\n"
-        msg += f"Логин: <code>{admin_username or admin_telegram_id}</code>\n"
-        msg += f"Пароль: <code>{password}</code>"
+        parts.append(
+            f"⚠️ Не удалось отправить пароль.\n"
+            f"Передайте вручную:\n"
+            f"Логин: <code>{admin_username or admin_telegram_id}</code>\n"
+            f"Пароль: <code>{password}</code>"
+        )
+    msg = "".join(parts)
     
     await callback.message.edit_text(msg)
     await callback.answer("Добавлено!")
@@ -651,15 +604,8 @@ async def cancel_add_admin(callback: CallbackQuery, state: FSMContext):
 
 # === Удаление админа ===
 
-@superadmin_router.callback_query(F.data.startswith("sa:remove_admin:"))
-async def callback_remove_admin(callback: CallbackQuery):
+async def callback_remove_admin(callback: CallbackQuery, admin_id: int):
     """Удалить админа"""
-    if not is_super_admin(callback.from_user.id):
-        await callback.answer("Нет доступа", show_alert=True)
-        return
-    
-    admin_id = int(callback.data.split(":")[2])
-    
     buttons = [
         [
             InlineKeyboardButton(
@@ -677,24 +623,15 @@ async def callback_remove_admin(callback: CallbackQuery):
     await callback.answer()
 
 
-@superadmin_router.callback_query(F.data.startswith("sa:confirm_remove_admin:"))
-async def confirm_remove_admin(callback: CallbackQuery):
+async def confirm_remove_admin(callback: CallbackQuery, admin_id: int):
     """Подтвердить удаление админа"""
-    if not is_super_admin(callback.from_user.id):
-        await callback.answer("Нет доступа", show_alert=True)
-        return
-    
-    admin_id = int(callback.data.split(":")[2])
-    
     async with async_session_maker() as db:
-        result = await db.execute(
-            select(Administrator).where(Administrator.id == admin_id)
-        )
-        admin = result.scalars().first()
+        admin = await db.get(Administrator, admin_id)
         
         if admin:
             admin.is_active = False  # Мягкое удаление
             await db.commit()
+            invalidate_admin(admin.telegram_id)
     
     await callback.message.edit_text("✅ Администратор удалён")
     await callback.answer("Удалено!")
@@ -702,24 +639,29 @@ async def confirm_remove_admin(callback: CallbackQuery):
 
 # === Навигация ===
 
+# Кнопки вида sa:<действие>:<id> разбираются одним обработчиком
+SA_ITEM_ACTIONS = {
+    "faculty": callback_faculty_details,
+    "delete_faculty": callback_delete_faculty,
+    "confirm_delete_faculty": confirm_delete_faculty,
+    "remove_admin": callback_remove_admin,
+    "confirm_remove_admin": confirm_remove_admin,
+}
+SA_ITEM_PATTERN = re.compile(rf"^sa:({'|'.join(SA_ITEM_ACTIONS)}):(\d+)$")
+
+
+@superadmin_router.callback_query(F.data.regexp(SA_ITEM_PATTERN).as_("match"))
+async def callback_sa_item(callback: CallbackQuery, match: re.Match):
+    """Действия над конкретным факультетом или админом"""
+    action, item_id = match.group(1), int(match.group(2))
+    await SA_ITEM_ACTIONS[action](callback, item_id)
+
+
 @superadmin_router.callback_query(F.data == "sa:back")
 async def callback_back(callback: CallbackQuery, state: FSMContext):
     """Назад в главное меню супер-админа"""
     await state.clear()
     
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="🏛 Факультеты", callback_data="sa:faculties")],
-        [InlineKeyboardButton(text="👑 Админы", callback_data="sa:admins")],
-        [InlineKeyboardButton(text="➕ Создать факультет", callback_data="sa:create_faculty")],
-        [InlineKeyboardButton(text="👤 Добавить админа", callback_data="sa:add_admin")],
-    ])
-    
-    await callback.message.edit_text(
-        "👑 <b>Панель супер-администратора</b>\n\n"
-        "Здесь вы можете:\n"
-        "• Создавать и управлять факультетами\n"
-        "• Назначать и удалять администраторов факультетов",
-        reply_markup=keyboard
-    )
+    await edit_text_safe(callback.message, MAIN_MENU_TEXT, reply_markup=MAIN_MENU_KEYBOARD)
     await callback.answer()
 
@@ -5,21 +5,38 @@ from aiogram import Router
 from aiogram.filters import Command
 from aiogram.types import Message, InlineKeyboardButton, InlineKeyboardMarkup, WebAppInfo
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
 
 from config import settings
 from db.engine import async_session_maker
-from db.models import User, Faculty, UserProgress, StageType, SubmissionStatus
+from db.models import User, Faculty, StageType, SubmissionStatus
 
 user_router = Router()
 
+STAGE_NAMES = {
+    StageType.QUESTIONNAIRE: "📝 Анкета",
+    StageType.HOME_VIDEO: "🎬 Домашнее видео",
+    StageType.INTERVIEW: "🎤 Собеседование",
+}
+
+STATUS_ICONS = {
+    SubmissionStatus.NOT_STARTED: "⚪",
+    SubmissionStatus.IN_PROGRESS: "🟡",
+    SubmissionStatus.SUBMITTED: "🔵",
+    SubmissionStatus.APPROVED: "🟢",
+    SubmissionStatus.REJECTED: "🔴",
+}
+
 
 @user_router.message(Command("status"))
 async def cmd_status(message: Message):
     """Проверить статус заявки"""
     async with async_session_maker() as db:
-        # Ищем пользователя
+        # Пользователь вместе с факультетом и прогрессом
         result = await db.execute(
-            select(User).where(User.telegram_id == message.from_user.id)
+            select(User)
+            .where(User.telegram_id == message.from_user.id)
+            .options(joinedload(User.faculty), selectinload(User.progress))
         )
         user = result.scalars().first()
         
@@ -30,54 +47,31 @@ async def cmd_status(message: Message):
             )
             return
         
-        # Получаем прогресс
-        result = await db.execute(
-            select(UserProgress).where(UserProgress.user_id == user.id)
-        )
-        progress_list = result.scalars().all()
-        
-        # Получаем факультет
-        result = await db.execute(
-            select(Faculty).where(Faculty.id == user.faculty_id)
-        )
-        faculty = result.scalars().first()
+        progress_list = user.progress
+        faculty = user.faculty
     
     # Формируем статус
-    status_text = f"👤 <b>{user.first_name} {user.surname or ''}</b>\n"
+    parts = [f"👤 <b>{user.first_name} {user.surname or ''}</b>\n"]
     
     if faculty:
-        status_text += f"🏫 Факультет: {faculty.name}\n\n"
+        parts.append(f"🏫 Факультет: {faculty.name}\n\n")
     
     if progress_list:
-        status_text += "<b>Прогресс по этапам:</b>\n\n"
-        
-        stage_names = {
-            StageType.QUESTIONNAIRE: "📝 Анкета",
-            StageType.HOME_VIDEO: "🎬 Домашнее видео",
-            StageType.INTERVIEW: "🎤 Собеседование",
-        }
-        
-        status_icons = {
-            SubmissionStatus.NOT_STARTED: "⚪",
-            SubmissionStatus.IN_PROGRESS: "🟡",
-            SubmissionStatus.SUBMITTED: "🔵",
-            SubmissionStatus.APPROVED: "🟢",
-            SubmissionStatus.REJECTED: "🔴",
-        }
+        parts.append("<b>Прогресс по этапам:</b>\n\n")
         
         for p in progress_list:
-            stage_name = stage_names.get(p.stage_type, p.stage_type.value)
-            icon = status_icons.get(p.status, "⚪")
-            status_text += f"{icon} {stage_name}: {p.status.value}\n"
+            stage_name = STAGE_NAMES.get(p.stage_type, p.stage_type.value)
+            icon = STATUS_ICONS.get(p.status, "⚪")
+            parts.append(f"{icon} {stage_name}: {p.status.value}\n")
             
             if p.submitted_at:
-                status_text += f"   <i>Отправлено: {p.submitted_at.strftime('%d.%m.%Y %H:%M')}</i>\n"
+                parts.append(f"   <i>Отправлено: {p.submitted_at.strftime('%d.%m.%Y %H:%M')}</i>\n")
             if p.rejection_reason:
-                status_text += f"   <i>Причина: {p.rejection_reason}</i>\n"
+                parts.append(f"   <i>Причина: {p.rejection_reason}</i>\n")
     else:
-        status_text += "<i>Вы ещё не начали заполнять анкету</i>"
+        parts.append("<i>Вы ещё не начали заполнять анкету</i>")
     
-    await message.answer(status_text)
+    await message.answer("".join(parts))
 
 
 @user_router.message(Command("register"))
@@ -4,46 +4,70 @@
 """
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator
 
 from aiogram import Router, F, Bot
+from aiogram.enums import ChatMemberStatus
 from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import joinedload, raiseload
 
+from bot.cache import get_head_admin, is_video_submitted, mark_video_submitted
+from bot.sending import send_to_many
 from db.session import async_session_maker
-from db.models import Administrator, Faculty, User, UserProgress, StageType, SubmissionStatus
+from db.models import Faculty, User, UserProgress, StageType, SubmissionStatus
 
 logger = logging.getLogger(__name__)
 
 video_stage_router = Router()
 
+# Ленивые загрузки в async-сессии недоступны: всё, что нужно, грузим явно,
+# а случайное обращение к незагруженной связи сразу падает с понятной ошибкой
+NO_LAZY = (raiseload("*"),)
 
-async def get_admin(telegram_id: int) -> Optional[Administrator]:
-    """Проверить, является ли пользователь админом (head_admin или reviewer)"""
-    async with async_session_maker() as db:
-        result = await db.execute(
-            select(Administrator).where(
-                Administrator.telegram_id == telegram_id,
-                Administrator.is_active == True
-            )
-        )
-        return result.scalars().first()
+# Статусы бота в чате, при которых он может отправлять туда видео
+CHAT_POSTING_STATUSES = frozenset({
+    ChatMemberStatus.CREATOR,
+    ChatMemberStatus.ADMINISTRATOR,
+    ChatMemberStatus.MEMBER,
+})
 
+RECIPIENTS_BATCH = 500  # получателей рассылки за один запрос к БД
 
-async def get_head_admin(telegram_id: int) -> Optional[Administrator]:
-    """Проверить, является ли пользователь главным админом"""
-    async with async_session_maker() as db:
-        result = await db.execute(
-            select(Administrator).where(
-                Administrator.telegram_id == telegram_id,
-                Administrator.role == "head_admin",
-                Administrator.is_active == True
-            )
-        )
-        return result.scalars().first()
+MAX_VIDEO_SIZE = 50 * 1024 * 1024  # 50 МБ — лимит, указанный в инструкции к загрузке
+
+ALREADY_SUBMITTED_TEXT = "⚠️ Вы уже отправили видео. Повторная отправка невозможна."
+
+VIDEO_CHAT_HEADER = "🎬 <b>Настройка чата для видео</b>\n\nФакультет: «{faculty_name}»\n\n"
+
+VIDEO_CHAT_HELP = (
+    "Чтобы настроить чат:\n"
+    "1. Добавьте бота в групповой чат\n"
+    "2. Дайте боту права администратора (чтобы он мог отправлять сообщения)\n"
+    "3. Отправьте команду /get_chat_id в этом чате\n"
+    "4. Скопируйте ID и отправьте его мне\n\n"
+    "<i>Или просто перешлите любое сообщение из нужного чата</i>"
+)
+
+BROADCAST_TEMPLATE = (
+    "🎬 <b>Второй этап отбора</b>\n\n"
+    "Поздравляем! Вы прошли первый этап отбора.\n\n"
+    "Теперь вам нужно загрузить <b>домашнее видео</b>.\n\n"
+    "<b>Как отправить видео:</b>\n"
+    "1. Нажмите кнопку «📹 Загрузить видео» ниже\n"
+    "2. Отправьте ваше видео в этот чат (личные сообщения с ботом)\n"
+    "3. Видео будет автоматически передано на проверку\n\n"
+    "<i>Все инструкции также доступны в Mini App</i>"
+)
+
+# Кнопка для загрузки видео
+UPLOAD_VIDEO_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text="📹 Загрузить видео", callback_data="video:upload")]
+])
 
 
 class VideoChatStates(StatesGroup):
@@ -83,10 +107,7 @@ async def cmd_video_chat(message: Message, state: FSMContext):
         return
     
     async with async_session_maker() as db:
-        result = await db.execute(
-            select(Faculty).where(Faculty.id == admin.faculty_id)
-        )
-        faculty = result.scalars().first()
+        faculty = await db.get(Faculty, admin.faculty_id, options=NO_LAZY)
     
     if not faculty:
         await message.answer("❌ Факультет не найден.")
@@ -94,20 +115,10 @@ async def cmd_video_chat(message: Message, state: FSMContext):
     
     current_chat_id = faculty.video_chat_id
     
-    text = f"🎬 <b>Настройка чата для видео</b>\n\n"
-    text += f"Факультет: «{faculty.name}»\n\n"
-    
-    if current_chat_id:
-        text += f"Текущий чат: <code>{current_chat_id}</code>\n\n"
-    else:
-        text += "Чат не настроен.\n\n"
-    
-    text += "Чтобы настроить чат:\n"
-    text += "1. Добавьте бота в групповой чат\n"
-    text += "2. Дайте боту права администратора (чтобы он мог отправлять сообщения)\n"
-    text += "3. Отправьте команду /get_chat_id в этом чате\n"
-    text += "4. Скопируйте ID и отправьте его мне\n\n"
-    text += "<i>Или просто перешлите любое сообщение из нужного чата</i>"
+    current_chat = (
+        f"Текущий чат: <code>{current_chat_id}</code>\n\n" if current_chat_id else "Чат не настроен.\n\n"
+    )
+    text = VIDEO_CHAT_HEADER.format(faculty_name=faculty.name) + current_chat + VIDEO_CHAT_HELP
     
     buttons = []
     if current_chat_id:
@@ -134,12 +145,9 @@ async def process_forwarded_chat(message: Message, state: FSMContext):
     faculty_id = data["faculty_id"]
     
     async with async_session_maker() as db:
-        result = await db.execute(
-            select(Faculty).where(Faculty.id == faculty_id)
+        await db.execute(
+            update(Faculty).where(Faculty.id == faculty_id).values(video_chat_id=chat_id)
         )
-        faculty = result.scalars().first()
-        
-        faculty.video_chat_id = chat_id
         await db.commit()
     
     await state.clear()
@@ -164,17 +172,16 @@ async def process_chat_id_text(message: Message, state: FSMContext):
     data = await state.get_data()
     faculty_id = data["faculty_id"]
     
-    # Проверяем, что бот может отправлять в этот чат
-    # (попробуем отправить тестовое сообщение)
+    # Проверяем, что бот состоит в чате и может писать туда
+    # (один запрос getChatMember вместо тестового сообщения с удалением)
     try:
-        test_msg = await message.bot.send_message(
-            chat_id,
-            "✅ Бот успешно подключён к этому чату!"
-        )
-        await message.bot.delete_message(chat_id, test_msg.message_id)
-        chat_accessible = True
+        member = await message.bot.get_chat_member(chat_id, message.bot.id)
+        chat_accessible = member.status in CHAT_POSTING_STATUSES
     except Exception as e:
-        logger.warning(f"Не удалось отправить сообщение в чат {chat_id}: {e}")
+        logger.warning(f"Не удалось проверить доступ к чату {chat_id}: {e}")
+        chat_accessible = False
+    
+    if not chat_accessible:
         await message.answer(
             f"⚠️ <b>Не удалось подключиться к чату</b>\n\n"
             f"Убедитесь, что:\n"
@@ -186,12 +193,9 @@ async def process_chat_id_text(message: Message, state: FSMContext):
         return
     
     async with async_session_maker() as db:
-        result = await db.execute(
-            select(Faculty).where(Faculty.id == faculty_id)
+        await db.execute(
+            update(Faculty).where(Faculty.id == faculty_id).values(video_chat_id=chat_id)
         )
-        faculty = result.scalars().first()
-        
-        faculty.video_chat_id = chat_id
         await db.commit()
     
     await state.clear()
@@ -212,12 +216,9 @@ async def callback_remove_chat(callback: CallbackQuery):
         return
     
     async with async_session_maker() as db:
-        result = await db.execute(
-            select(Faculty).where(Faculty.id == admin.faculty_id)
+        await db.execute(
+            update(Faculty).where(Faculty.id == admin.faculty_id).values(video_chat_id=None)
         )
-        faculty = result.scalars().first()
-        
-        faculty.video_chat_id = None
         await db.commit()
     
     await callback.message.edit_text("✅ Настройка чата удалена.")
@@ -234,6 +235,36 @@ async def callback_cancel_chat(callback: CallbackQuery, state: FSMContext):
 
 # === Рассылка сообщения с кнопкой "Загрузить видео" ===
 
+async def iter_questionnaire_submitters(faculty_id: int) -> AsyncIterator[int]:
+    """
+    Telegram ID пользователей факультета, отправивших анкету.
+    Читаются страницами по id (keyset), для каждой страницы — своя короткая сессия:
+    рассылка идёт минутами, и держать всё это время соединение и транзакцию нельзя.
+    """
+    last_id = 0
+    while True:
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(User.id, User.telegram_id)
+                .join(UserProgress, User.id == UserProgress.user_id)
+                .where(
+                    User.faculty_id == faculty_id,
+                    UserProgress.stage_type == StageType.QUESTIONNAIRE,
+                    UserProgress.status == SubmissionStatus.SUBMITTED,
+                    User.id > last_id,
+                )
+                .order_by(User.id)
+                .limit(RECIPIENTS_BATCH)
+            )
+            rows = result.all()
+        
+        for row in rows:
+            yield row.telegram_id
+        if len(rows) < RECIPIENTS_BATCH:
+            return
+        last_id = rows[-1].id
+
+
 @video_stage_router.message(Command("send_video_request"))
 async def cmd_send_video_request(message: Message):
     """Разослать сообщение с кнопкой загрузки видео"""
@@ -244,10 +275,7 @@ async def cmd_send_video_request(message: Message):
         return
     
     async with async_session_maker() as db:
-        result = await db.execute(
-            select(Faculty).where(Faculty.id == admin.faculty_id)
-        )
-        faculty = result.scalars().first()
+        faculty = await db.get(Faculty, admin.faculty_id, options=NO_LAZY)
         
         if not faculty:
             await message.answer("❌ Факультет не найден.")
@@ -266,54 +294,19 @@ async def cmd_send_video_request(message: Message):
                 "Используйте /video_chat чтобы настроить чат."
             )
             return
-        
-        # Получаем пользователей, которые отправили анкету
-        result = await db.execute(
-            select(User.telegram_id, User.first_name, User.surname)
-            .join(UserProgress, User.id == UserProgress.user_id)
-            .where(
-                User.faculty_id == admin.faculty_id,
-                UserProgress.stage_type == StageType.QUESTIONNAIRE,
-                UserProgress.status == SubmissionStatus.SUBMITTED
-            )
-        )
-        users = result.fetchall()
-        
-        if not users:
-            await message.answer("❌ Нет пользователей, которые отправили анкету.")
-            return
     
-    # Кнопка для загрузки видео
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="📹 Загрузить видео", callback_data="video:upload")]
-    ])
-    
-    broadcast_text = (
-        f"🎬 <b>Второй этап отбора</b>\n\n"
-        f"Поздравляем! Вы прошли первый этап отбора.\n\n"
-        f"Теперь вам нужно загрузить <b>домашнее видео</b>.\n\n"
-        f"<b>Как отправить видео:</b>\n"
-        f"1. Нажмите кнопку «📹 Загрузить видео» ниже\n"
-        f"2. Отправьте ваше видео в этот чат (личные сообщения с ботом)\n"
-        f"3. Видео будет автоматически передано на проверку\n\n"
-        f"<i>Все инструкции также доступны в Mini App</i>"
+    # Отправляем сообщения параллельно (с ограничением одновременных запросов);
+    # соединение с БД на время рассылки не удерживается
+    success, failed = await send_to_many(
+        lambda user_id: message.bot.send_message(
+            user_id, BROADCAST_TEMPLATE, reply_markup=UPLOAD_VIDEO_KEYBOARD
+        ),
+        iter_questionnaire_submitters(admin.faculty_id),
     )
     
-    # Отправляем сообщения
-    success = 0
-    failed = 0
-    
-    for user_id, first_name, surname in users:
-        try:
-            await message.bot.send_message(
-                user_id,
-                broadcast_text,
-                reply_markup=keyboard
-            )
-            success += 1
-        except Exception as e:
-            logger.warning(f"Не удалось отправить сообщение {user_id}: {e}")
-            failed += 1
+    if not success and not failed:
+        await message.answer("❌ Нет пользователей, которые отправили анкету.")
+        return
     
     await message.answer(
         f"✅ <b>Рассылка завершена</b>\n\n"
@@ -324,23 +317,23 @@ async def cmd_send_video_request(message: Message):
 
 # === Обработка загрузки видео ===
 
-@video_stage_router.callback_query(F.data == "video:upload")
+@video_stage_router.callback_query(F.data == "video:upload", flags={"throttling_key": "video_upload"})
 async def callback_video_upload(callback: CallbackQuery):
     """Пользователь нажал кнопку загрузки видео"""
     async with async_session_maker() as db:
         result = await db.execute(
-            select(User).where(User.telegram_id == callback.from_user.id)
+            select(User)
+            .where(User.telegram_id == callback.from_user.id)
+            .options(joinedload(User.faculty), *NO_LAZY)
         )
-        user = result.scalars().first()
+        user = result.scalar_one_or_none()
         
         if not user:
             await callback.answer("Вы не зарегистрированы", show_alert=True)
             return
         
-        result = await db.execute(
-            select(Faculty).where(Faculty.id == user.faculty_id)
-        )
-        faculty = result.scalars().first()
+        # Факультет загружен тем же запросом, что и пользователь (joined)
+        faculty = user.faculty
         
         if not faculty:
             await callback.answer("Факультет не найден", show_alert=True)
@@ -362,23 +355,28 @@ async def callback_video_upload(callback: CallbackQuery):
     await callback.answer()
 
 
-@video_stage_router.message(F.video)
+@video_stage_router.message(F.video, flags={"throttling_key": "video_submit"})
 async def handle_video_submission(message: Message, bot: Bot):
     """Обработать отправленное видео"""
+    # Слишком большие видео отсекаем до обращения к БД
+    if message.video.file_size and message.video.file_size > MAX_VIDEO_SIZE:
+        await message.answer("❌ Видео слишком большое. Максимальный размер: 50 МБ.")
+        return
+    
     async with async_session_maker() as db:
         result = await db.execute(
-            select(User).where(User.telegram_id == message.from_user.id)
+            select(User)
+            .where(User.telegram_id == message.from_user.id)
+            .options(joinedload(User.faculty), *NO_LAZY)
         )
-        user = result.scalars().first()
+        user = result.scalar_one_or_none()
         
         if not user:
             await message.answer("❌ Вы не зарегистрированы.")
             return
         
-        result = await db.execute(
-            select(Faculty).where(Faculty.id == user.faculty_id)
-        )
-        faculty = result.scalars().first()
+        # Факультет загружен тем же запросом, что и пользователь (joined)
+        faculty = user.faculty
         
         if not faculty:
             await message.answer("❌ Факультет не найден.")
@@ -392,46 +390,51 @@ async def handle_video_submission(message: Message, bot: Bot):
             await message.answer("❌ Приём видео закрыт администратором.")
             return
         
-        # Проверяем, не отправлял ли уже видео
-        result = await db.execute(
-            select(UserProgress).where(
-                UserProgress.user_id == user.id,
-                UserProgress.stage_type == StageType.HOME_VIDEO
-            )
-        )
-        existing_progress = result.scalars().first()
-        
-        if existing_progress and existing_progress.status == SubmissionStatus.SUBMITTED:
-            await message.answer("⚠️ Вы уже отправили видео. Повторная отправка невозможна.")
+        # Повторные отправки отсекаем по Redis, не трогая user_progress
+        faculty_id, user_id = faculty.id, user.id
+        if await is_video_submitted(faculty_id, user_id):
+            await message.answer(ALREADY_SUBMITTED_TEXT)
             return
         
-        # Обновляем или создаём прогресс
-        if existing_progress:
-            progress = existing_progress
-        else:
-            progress = UserProgress(
-                user_id=user.id,
-                faculty_id=user.faculty_id,
+        # Данные для подписи к видео (expire_on_commit=False — после commit они не перечитываются)
+        video_chat_id = faculty.video_chat_id
+        user_name = f"{user.first_name} {user.surname or ''}".strip()
+        user_telegram_id = user.telegram_id
+        
+        # Создаём или обновляем прогресс одним запросом; уже отправленное видео не перезаписываем
+        now = datetime.now()
+        result = await db.execute(
+            insert(UserProgress)
+            .values(
+                user_id=user_id,
+                faculty_id=faculty_id,
                 stage_type=StageType.HOME_VIDEO,
                 status=SubmissionStatus.SUBMITTED,
-                submitted_at=datetime.now()
+                submitted_at=now,
             )
-            db.add(progress)
-        
-        progress.status = SubmissionStatus.SUBMITTED
-        progress.submitted_at = datetime.now()
+            .on_conflict_do_update(
+                constraint="uq_user_progress_user_stage",
+                set_={"status": SubmissionStatus.SUBMITTED, "submitted_at": now},
+                where=UserProgress.status != SubmissionStatus.SUBMITTED,
+            )
+            .returning(UserProgress.id)
+        )
+        if result.scalar_one_or_none() is None:
+            await mark_video_submitted(faculty_id, user_id)
+            await message.answer(ALREADY_SUBMITTED_TEXT)
+            return
         await db.commit()
+        await mark_video_submitted(faculty_id, user_id)
         
         # Отправляем видео в групповой чат
-        if faculty.video_chat_id:
+        if video_chat_id:
             try:
-                user_name = f"{user.first_name} {user.surname or ''}".strip()
                 submission_time = datetime.now().strftime("%d.%m.%Y %H:%M")
                 
                 caption = (
                     f"📹 <b>Видео от кандидата</b>\n\n"
                     f"👤 <b>{user_name}</b>\n"
-                    f"🆔 ID: <code>{user.telegram_id}</code>\n"
+                    f"🆔 ID: <code>{user_telegram_id}</code>\n"
                     f"⏰ Время отправки: {submission_time}"
                 )
                 
@@ -439,7 +442,7 @@ async def handle_video_submission(message: Message, bot: Bot):
                     caption += f"\n\n💬 <i>Комментарий кандидата:</i>\n{message.caption}"
                 
                 await bot.send_video(
-                    faculty.video_chat_id,
+                    video_chat_id,
                     message.video.file_id,
                     caption=caption,
                     parse_mode="HTML"
@@ -450,7 +453,7 @@ async def handle_video_submission(message: Message, bot: Bot):
                     "Ваше видео получено и отправлено на проверку."
                 )
             except Exception as e:
-                logger.error(f"Не удалось отправить видео в чат {faculty.video_chat_id}: {e}")
+                logger.error(f"Не удалось отправить видео в чат {video_chat_id}: {e}")
                 await message.answer(
                     "✅ Видео получено, но произошла ошибка при отправке в группу.\n"
                     "Обратитесь к администратору."
@@ -474,10 +477,7 @@ async def cmd_video_toggle(message: Message):
         return
     
     async with async_session_maker() as db:
-        result = await db.execute(
-            select(Faculty).where(Faculty.id == admin.faculty_id)
-        )
-        faculty = result.scalars().first()
+        faculty = await db.get(Faculty, admin.faculty_id, options=NO_LAZY)
     
     if not faculty:
         await message.answer("❌ Факультет не найден.")
@@ -490,12 +490,19 @@ async def cmd_video_toggle(message: Message):
         )
         return
     
-    # Переключаем статус
-    faculty.video_submission_open = not faculty.video_submission_open
-    await db.commit()
+    # Переключаем статус одним UPDATE (раньше изменение делалось уже после закрытия сессии)
+    async with async_session_maker() as db:
+        result = await db.execute(
+            update(Faculty)
+            .where(Faculty.id == faculty.id)
+            .values(video_submission_open=~Faculty.video_submission_open)
+            .returning(Faculty.video_submission_open)
+        )
+        is_open = result.scalar_one()
+        await db.commit()
     
-    status = "открыт" if faculty.video_submission_open else "закрыт"
-    emoji = "✅" if faculty.video_submission_open else "❌"
+    status = "открыт" if is_open else "закрыт"
+    emoji = "✅" if is_open else "❌"
     
     await message.answer(
         f"{emoji} <b>Приём видео {status}</b>\n\n"
@@ -0,0 +1,114 @@
+"""
+Middleware бота.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable
+from weakref import WeakValueDictionary
+
+import redis.asyncio as redis
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import CallbackQuery, Message, TelegramObject
+
+from bot.cache import get_redis
+from config import settings
+
+
+class UserLockMiddleware(BaseMiddleware):
+    """
+    Обрабатывает апдейты одного пользователя строго по очереди.
+
+    При пересылке нескольких сообщений сразу апдейты приходят пачкой и без
+    блокировки попадают в один и тот же шаг FSM до того, как первый вызовет set_state.
+    Регистрируется как outer-middleware на dp.message: состояние FSM к этому моменту
+    уже прочитано, поэтому после взятия блокировки оно перечитывается.
+    """
+
+    def __init__(self):
+        # Блокировка живёт, пока её кто-то держит или ждёт
+        self._locks: WeakValueDictionary[int, asyncio.Lock] = WeakValueDictionary()
+
+    def _lock(self, user_id: int) -> asyncio.Lock:
+        lock = self._locks.get(user_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[user_id] = lock
+        return lock
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        if user is None:
+            return await handler(event, data)
+
+        async with self._lock(user.id):
+            state = data.get("state")
+            if state is not None:
+                data["raw_state"] = await state.get_state()
+            return await handler(event, data)
+
+
+class SuperAdminMiddleware(BaseMiddleware):
+    """Пропускает к обработчикам роутера только супер-админов"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        if user is not None and settings.is_super_admin(user.id):
+            return await handler(event, data)
+
+        if isinstance(event, CallbackQuery):
+            await event.answer("Нет доступа", show_alert=True)
+        elif isinstance(event, Message):
+            await event.answer("⛔ У вас нет прав супер-администратора")
+        return None
+
+
+THROTTLE_RATE = 1  # секунды между событиями одного пользователя для одного обработчика
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Отсекает частые повторы до обработчика (и до запросов к БД).
+
+    Действует только на обработчики с флагом throttling_key:
+    @router.message(..., flags={"throttling_key": "video_submit"}).
+    Ключ в Redis ставится через SET NX EX — если он уже есть, событие отбрасывается,
+    а пользователю отвечают, что нужно повторить (молча ничего не теряется).
+    """
+
+    def __init__(self, rate: int = THROTTLE_RATE):
+        self.rate = rate
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        key = get_flag(data, "throttling_key")
+        user = data.get("event_from_user")
+        if key is None or user is None:
+            return await handler(event, data)
+
+        try:
+            allowed = await get_redis().set(f"throttle:{user.id}:{key}", 1, nx=True, ex=self.rate)
+        except redis.RedisError:
+            allowed = True  # без Redis не ограничиваем
+
+        if allowed:
+            return await handler(event, data)
+
+        if isinstance(event, CallbackQuery):
+            await event.answer("⏳ Слишком часто, подождите секунду")
+        elif isinstance(event, Message):
+            await event.answer("⏳ Слишком часто. Подождите секунду и отправьте ещё раз.")
+        return None
@@ -0,0 +1,123 @@
+"""
+Отправка запросов в Telegram: повторы при сетевых сбоях и безопасное редактирование.
+"""
+import asyncio
+import logging
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable, TypeVar
+
+from aiogram.exceptions import TelegramBadRequest, TelegramNetworkError, TelegramRetryAfter
+from aiogram.types import Message
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SEND_TRIES = 3
+SEND_BASE_DELAY = 0.5  # секунды: 0.5 → 1 → 2
+
+
+async def call_with_retry(
+    fn: Callable[..., Awaitable[T]],
+    *args: Any,
+    tries: int = SEND_TRIES,
+    base_delay: float = SEND_BASE_DELAY,
+    **kwargs: Any,
+) -> T:
+    """
+    Вызвать метод бота, повторяя при сетевой ошибке (экспоненциальная задержка)
+    и при флуд-контроле (ждём столько, сколько просит Telegram).
+    """
+    for attempt in range(tries):
+        try:
+            return await fn(*args, **kwargs)
+        except TelegramRetryAfter as e:
+            if attempt == tries - 1:
+                raise
+            await asyncio.sleep(e.retry_after)
+        except (TelegramNetworkError, asyncio.TimeoutError) as e:
+            if attempt == tries - 1:
+                raise
+            delay = base_delay * 2 ** attempt
+            logger.warning("Сетевая ошибка Telegram (%s), повтор через %.1f с", e, delay)
+            await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+async def edit_text_safe(message: Message, text: str, **kwargs: Any) -> None:
+    """
+    Отредактировать сообщение, игнорируя «message is not modified»
+    (повторное нажатие на ту же кнопку навигации не считается ошибкой).
+    """
+    try:
+        await message.edit_text(text, **kwargs)
+    except TelegramBadRequest as e:
+        if "message is not modified" not in str(e):
+            raise
+
+
+BROADCAST_CONCURRENCY = 25  # одновременных запросов (скрывает задержку сети)
+BROADCAST_RATE = 25  # запросов в секунду: Telegram допускает ~30 сообщений в секунду на бота
+
+
+class RatePacer:
+    """Равномерно разносит вызовы во времени: не чаще rate в секунду на всех воркеров"""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self._next_at = 0.0
+
+    async def wait(self) -> None:
+        """Дождаться своей очереди (слот резервируется сразу, без гонки между воркерами)"""
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_at)
+        self._next_at = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+async def send_to_many(
+    send: Callable[[int], Awaitable[Any]],
+    chat_ids: Iterable[int] | AsyncIterable[int],
+    concurrency: int = BROADCAST_CONCURRENCY,
+    rate: float = BROADCAST_RATE,
+) -> tuple[int, int]:
+    """
+    Разослать сообщения параллельно: не более concurrency запросов одновременно
+    и не более rate запросов в секунду (включая повторы).
+    send(chat_id) отправляет одно сообщение. chat_ids может быть асинхронным
+    потоком — отправка начинается с первых id, а в памяти держится не больше
+    concurrency id. Возвращает (доставлено, ошибок).
+    """
+    queue: asyncio.Queue[int | None] = asyncio.Queue(maxsize=concurrency)
+    pacer = RatePacer(rate)
+    success = failed = 0
+
+    async def paced_send(chat_id: int) -> Any:
+        await pacer.wait()
+        return await send(chat_id)
+
+    async def worker() -> None:
+        nonlocal success, failed
+        while (chat_id := await queue.get()) is not None:
+            try:
+                await call_with_retry(paced_send, chat_id)
+                success += 1
+            except Exception as e:
+                logger.warning("Не удалось отправить сообщение %s: %s", chat_id, e)
+                failed += 1
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        if isinstance(chat_ids, AsyncIterable):
+            async for chat_id in chat_ids:
+                await queue.put(chat_id)
+        else:
+            for chat_id in chat_ids:
+                await queue.put(chat_id)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+    return success, failed
@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 from typing import Literal
+from functools import cached_property, lru_cache
 
 
 class Settings(BaseSettings):
@@ -23,15 +24,34 @@ class Settings(BaseSettings):
     postgres_password: str = Field(default="", alias="POSTGRES_PASSWORD")
     postgres_db: str = Field(default="postgres", alias="POSTGRES_DB")
 
+    # Пул соединений к БД
+    db_pool_size: int = Field(default=20, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=40, alias="DB_MAX_OVERFLOW")
+    db_pool_recycle: int = Field(default=1800, alias="DB_POOL_RECYCLE")  # секунды
+    db_pool_timeout: int = Field(default=30, alias="DB_POOL_TIMEOUT")  # секунды ожидания свободного соединения
+    db_command_timeout: int = Field(default=60, alias="DB_COMMAND_TIMEOUT")  # секунды на один запрос
+    # SELECT 1 перед каждой выдачей соединения из пула; можно выключить, если БД не перезапускается
+    # без рестарта приложения (устаревшие соединения и так отсекает pool_recycle)
+    db_pool_pre_ping: bool = Field(default=True, alias="DB_POOL_PRE_PING")
+
     # Redis
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_db: int = 0
     redis_draft_ttl: int = 60 * 60 * 24 * 7  # 7 дней TTL для черновиков
+    fsm_ttl: int = 60 * 60 * 24  # Сутки TTL для состояний FSM бота
 
     # Telegram
     telegram_bot_token: str = ""
     
+    # Webhook (если задан публичный URL — бот работает через webhook, иначе long polling)
+    bot_webhook_url: str = ""                 # Напр. "https://putevod-ik.ru"
+    bot_webhook_path: str = "/bot/webhook"
+    bot_webhook_secret: str = ""              # X-Telegram-Bot-Api-Secret-Token
+    bot_webhook_host: str = "0.0.0.0"
+    bot_webhook_port: int = 8080
+    bot_webhook_max_connections: int = 100
+    
     # Супер-админы (могут создавать факультеты и назначать админов)
     # Список Telegram ID через запятую: "123456789,987654321"
     super_admin_ids: str = ""
@@ -56,12 +76,10 @@ class Settings(BaseSettings):
     def is_dev(self) -> bool:
         return self.env == "dev"
     
-    @property
-    def super_admins(self) -> list[int]:
-        """Список Telegram ID супер-админов"""
-        if not self.super_admin_ids:
-            return []
-        return [int(x.strip()) for x in self.super_admin_ids.split(",") if x.strip()]
+    @cached_property
+    def super_admins(self) -> frozenset[int]:
+        """Множество Telegram ID супер-админов (разбирается один раз)"""
+        return frozenset(int(x.strip()) for x in self.super_admin_ids.split(",") if x.strip())
     
     def is_super_admin(self, telegram_id: int) -> bool:
         """Проверка, является ли пользователь супер-админом"""
@@ -70,4 +88,10 @@ class Settings(BaseSettings):
         return telegram_id in self.super_admins
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Настройки процесса (.env читается один раз)"""
+    return Settings()
+
+
+settings = get_settings()
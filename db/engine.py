@@ -1,11 +1,45 @@
+import asyncio
+
+from sqlalchemy import text
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from config import settings
 
 
 
-engine = create_async_engine(url=settings.database_url)
-async_session_maker = async_sessionmaker(bind=engine, class_=AsyncSession)
+engine = create_async_engine(
+    url=settings.database_url,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    pool_recycle=settings.db_pool_recycle,
+    pool_timeout=settings.db_pool_timeout,
+    connect_args={
+        "command_timeout": settings.db_command_timeout,
+        "server_settings": {
+            "application_name": "sst_otbor",
+            # JIT только замедляет короткие OLTP-запросы бота и API
+            "jit": "off",
+        },
+    },
+)
+# expire_on_commit=False: после commit объекты не сбрасываются, и чтение их атрибутов
+# не уходит повторным SELECT (в async — не падает MissingGreenlet)
+async_session_maker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def warm_up_pool() -> None:
+    """Открыть pool_size соединений заранее, чтобы первые запросы не ждали подключения к БД"""
+    async def open_connection():
+        conn = await engine.connect()
+        await conn.execute(text("SELECT 1"))
+        return conn
+    
+    connections = await asyncio.gather(*(open_connection() for _ in range(settings.db_pool_size)))
+    for conn in connections:
+        await conn.close()  # возвращается в пул, а не закрывается
 
 
 class Base(DeclarativeBase):
@@ -6,16 +6,19 @@ from sqlalchemy import (
     String,
     ForeignKey,
     Boolean,
-    JSON,
     DateTime,
     Date,
     Time,
     Text,
     BigInteger,
     Enum as SQLEnum,
+    CheckConstraint,
+    Index,
     UniqueConstraint,
     func,
+    text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from db.engine import Base
@@ -52,13 +55,18 @@ class User(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # relations
-    faculty = relationship("Faculty", back_populates="users", lazy="joined")
+    faculty = relationship("Faculty", back_populates="users", lazy="raise_on_sql")
     questionnaires = relationship("Questionnaire", back_populates="user", cascade="all, delete-orphan")
     home_videos = relationship("HomeVideo", back_populates="user", cascade="all, delete-orphan")
     interviews = relationship("Interview", back_populates="user", cascade="all, delete-orphan")
     progress = relationship("UserProgress", back_populates="user", cascade="all, delete-orphan")
     approvals = relationship("ApprovalQueue", back_populates="user", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Пользователи факультета (рассылки, статистика); id — для index-only соединений
+        Index('ix_users_faculty_id', 'faculty_id', 'id'),
+    )
+
 
 class AdminRole(str, Enum):
     """Роли администраторов"""
@@ -85,15 +93,19 @@ class Administrator(Base):
     email: Mapped[str | None] = mapped_column(String(255), unique=True, nullable=True)  # Для веб-интерфейса
     password_hash: Mapped[str | None] = mapped_column(String(255), nullable=True)  # Для веб-интерфейса
     faculty_id: Mapped[int | None] = mapped_column(ForeignKey("faculty.id", ondelete="RESTRICT"), nullable=True)
-    role: Mapped[str] = mapped_column(String(30), default="reviewer")  # head_admin, reviewer
+    role: Mapped[AdminRole] = mapped_column(SQLEnum(AdminRole), default=AdminRole.REVIEWER)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     added_by: Mapped[int | None] = mapped_column(BigInteger, nullable=True)  # Кто добавил (telegram_id)
 
-    faculty = relationship("Faculty", back_populates="administrators", lazy="joined")
+    faculty = relationship("Faculty", back_populates="administrators", lazy="raise_on_sql")
     slot_availability = relationship("SlotAvailability", back_populates="interviewer", cascade="all, delete-orphan")
     time_slot_availability = relationship("TimeSlotAvailability", back_populates="interviewer", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index('ix_admin_fac_role_active', 'faculty_id', 'role', 'is_active'),
+    )
+
 
 class Faculty(Base):
     """Факультет с собственными этапами отбора и администраторами"""
@@ -154,13 +166,19 @@ class StageTemplate(Base):
     faculty_id: Mapped[int] = mapped_column(ForeignKey("faculty.id", ondelete="CASCADE"))
     stage_type: Mapped[StageType] = mapped_column(SQLEnum(StageType))  # К какому этапу относится
     version: Mapped[int] = mapped_column(Integer, default=1)
-    questions: Mapped[dict] = mapped_column(JSON)  # JSONB in Postgres
+    questions: Mapped[dict] = mapped_column(JSONB)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_by: Mapped[int | None] = mapped_column(ForeignKey("administrators.id", ondelete="SET NULL"), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     faculty = relationship("Faculty", back_populates="templates")
-    creator = relationship("Administrator", lazy="joined")
+    creator = relationship("Administrator", lazy="raise_on_sql")
+
+    __table_args__ = (
+        # Текущий шаблон этапа: WHERE faculty_id = ? AND stage_type = ? AND is_active
+        # ORDER BY version DESC LIMIT 1 (неактивные версии в индекс не попадают)
+        Index('ix_active_template', 'faculty_id', 'stage_type', 'version', postgresql_where=text('is_active')),
+    )
 
 
 class Questionnaire(Base):
@@ -174,13 +192,19 @@ class Questionnaire(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     faculty_id: Mapped[int] = mapped_column(ForeignKey("faculty.id", ondelete="CASCADE"))
     template_id: Mapped[int | None] = mapped_column(ForeignKey("stage_templates.id", ondelete="SET NULL"), nullable=True)
-    answers: Mapped[dict] = mapped_column(JSON)  # Финальные ответы
+    # Финальные ответы; в списки не грузятся — нужны undefer_group('payload')
+    answers: Mapped[dict] = mapped_column(JSONB, deferred=True, deferred_group='payload')
     submitted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="questionnaires")
     faculty = relationship("Faculty")
     template = relationship("StageTemplate")
 
+    __table_args__ = (
+        # Строки добавляются по времени — для выборок по диапазону дат хватает BRIN
+        Index('ix_questionnaires_submitted_brin', 'submitted_at', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+    )
+
 
 class HomeVideo(Base):
     """Домашнее видео, загруженное пользователем"""
@@ -196,6 +220,10 @@ class HomeVideo(Base):
     user = relationship("User", back_populates="home_videos")
     faculty = relationship("Faculty")
 
+    __table_args__ = (
+        Index('ix_home_videos_submitted_brin', 'submitted_at', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+    )
+
 
 class InterviewSlot(Base):
     """Слоты для записи на собеседование"""
@@ -250,6 +278,21 @@ class Interview(Base):
     time_slot = relationship("TimeSlot", back_populates="interviews", foreign_keys=[time_slot_id])
     interviewer = relationship("Administrator", foreign_keys=[interviewer_id])
 
+    __table_args__ = (
+        # Занятость слота: WHERE slot_id = ? AND status != 'cancelled'
+        Index('ix_interview_slot_status', 'slot_id', 'status'),
+        # Записи на временные слоты дня: WHERE time_slot_id IN (...)
+        Index('ix_interview_time_slot', 'time_slot_id'),
+        # Собеседования факультета по статусу (отчёты): index-only scan без обращения к таблице
+        Index(
+            'ix_interview_faculty_status_covering',
+            'faculty_id',
+            'status',
+            postgresql_include=['score', 'completed_at', 'interviewer_id'],
+        ),
+        Index('ix_interviews_created_brin', 'created_at', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+    )
+
 
 class SlotAvailability(Base):
     """
@@ -321,6 +364,12 @@ class TimeSlot(Base):
 
     __table_args__ = (
         UniqueConstraint('day_id', 'time', name='uq_day_time'),
+        # Активные слоты дня. Счётчик мест в условие не входит: иначе каждая запись
+        # на собеседование перестраивала бы индекс (и не была бы HOT-обновлением)
+        Index('ix_timeslot_active', 'day_id', 'time', postgresql_where=text('is_active')),
+        # current_participants поддерживает триггер на interviews (см. миграцию
+        # add_timeslot_participants_trigger); мест не может стать больше, чем задано
+        CheckConstraint('current_participants <= max_participants', name='ck_timeslot_capacity'),
     )
 
 
@@ -373,6 +422,15 @@ class UserProgress(Base):
     user = relationship("User", back_populates="progress")
     faculty = relationship("Faculty")
 
+    __table_args__ = (
+        # Одна запись прогресса на пользователя и этап (нужна для INSERT ... ON CONFLICT)
+        UniqueConstraint('user_id', 'stage_type', name='uq_user_progress_user_stage'),
+        # Кто прошёл этап со статусом X: WHERE stage_type = ? AND status = ?, user_id — для join без обращения к таблице
+        Index('ix_progress_stage_status_user', 'stage_type', 'status', 'user_id'),
+        # Статистика факультета: WHERE faculty_id = ? AND stage_type = ? GROUP BY status
+        Index('ix_progress_faculty_stage_status', 'faculty_id', 'stage_type', 'status'),
+    )
+
 
 class ApprovalStatus(str, Enum):
     """Статусы проверки"""
@@ -389,7 +447,8 @@ class ApprovalQueue(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     faculty_id: Mapped[int] = mapped_column(ForeignKey("faculty.id", ondelete="CASCADE"))
     stage_type: Mapped[StageType] = mapped_column(SQLEnum(StageType))
-    answers: Mapped[dict] = mapped_column(JSON)  # Ответы на момент отправки
+    # Ответы на момент отправки; в списки не грузятся — нужны undefer_group('payload')
+    answers: Mapped[dict] = mapped_column(JSONB, deferred=True, deferred_group='payload')
     status: Mapped[ApprovalStatus] = mapped_column(
         SQLEnum(ApprovalStatus), 
         default=ApprovalStatus.PENDING
@@ -401,7 +460,13 @@ class ApprovalQueue(Base):
 
     user = relationship("User", back_populates="approvals")
     faculty = relationship("Faculty")
-    reviewer = relationship("Administrator", lazy="joined")
+    reviewer = relationship("Administrator", lazy="raise_on_sql")
+
+    __table_args__ = (
+        # Только ожидающие проверки — живая часть очереди (SQLEnum хранит имя: 'PENDING'):
+        # заявки факультета по порядку поступления (list_pending_by_faculty) и счётчики
+        Index('ix_approval_pending_faculty_id', 'faculty_id', 'id', postgresql_where=text("status = 'PENDING'")),
+    )
 
 
 class AdminActionLog(Base):
@@ -417,10 +482,14 @@ class AdminActionLog(Base):
     action: Mapped[str] = mapped_column(String(50))  # stage_opened, stage_closed, submission_approved, etc.
     target_type: Mapped[str | None] = mapped_column(String(50), nullable=True)  # user, stage, template
     target_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
-    details: Mapped[dict | None] = mapped_column(JSON, nullable=True)  # Дополнительные данные
+    details: Mapped[dict | None] = mapped_column(JSONB, nullable=True)  # Дополнительные данные
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
-    admin = relationship("Administrator", lazy="joined")
+    admin = relationship("Administrator", lazy="raise_on_sql")
     faculty = relationship("Faculty")
 
+    __table_args__ = (
+        Index('ix_admin_action_logs_created_brin', 'created_at', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+    )
+
 
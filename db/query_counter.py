@@ -0,0 +1,58 @@
+"""
+Подсчёт SQL-запросов — страховка от возврата N+1.
+
+    with count_queries(max_queries=3) as counter:
+        await repo.list_pending_by_faculty(faculty_id)
+    counter.count  # сколько запросов ушло в БД внутри блока
+
+Считаются только запросы текущего контекста (contextvars): параллельные
+запросы API и апдейты бота в счётчик не попадают. Вложенные блоки считают
+независимо — внешний видит и запросы внутреннего.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from sqlalchemy import event
+
+from db.engine import engine
+
+
+@dataclass
+class QueryCounter:
+    """SQL, выполненный внутри count_queries"""
+    statements: list[str] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+_active_counters: ContextVar[tuple[QueryCounter, ...]] = ContextVar("query_counters", default=())
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    for counter in _active_counters.get():
+        counter.statements.append(statement)
+
+
+@contextmanager
+def count_queries(max_queries: int | None = None) -> Iterator[QueryCounter]:
+    """
+    Считать запросы к БД внутри блока.
+    Если задан max_queries и он превышен — AssertionError со списком запросов.
+    """
+    counter = QueryCounter()
+    token = _active_counters.set(_active_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _active_counters.reset(token)
+
+    if max_queries is not None and counter.count > max_queries:
+        raise AssertionError(
+            f"Ожидалось не больше {max_queries} запросов, выполнено {counter.count}:\n"
+            + "\n".join(counter.statements)
+        )
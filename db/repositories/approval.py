@@ -1,9 +1,33 @@
 from typing import Optional, List
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import raiseload, selectinload, undefer_group
 
-from db.models import ApprovalQueue
+from db.models import ApprovalQueue, ApprovalStatus
+
+# Запросы собираются один раз при импорте; параметры передаются через bindparam
+GET_BY_ID_STMT = (
+    select(ApprovalQueue)
+    .where(ApprovalQueue.id == bindparam("approval_id"))
+    .options(undefer_group('payload'))
+)
+# Факультет хранится в самой заявке — фильтр без соединения с users,
+# пользователи заявок догружаются одним запросом WHERE id IN (...)
+PENDING_BY_FACULTY_STMT = (
+    select(ApprovalQueue)
+    .where(
+        ApprovalQueue.status == ApprovalStatus.PENDING,
+        ApprovalQueue.faculty_id == bindparam("faculty_id"),
+        # Keyset-пагинация: страница начинается после последней показанной заявки,
+        # поэтому любая страница стоит как первая (без OFFSET)
+        ApprovalQueue.id > bindparam("after_id"),
+    )
+    # Остальные связи не грузятся: случайное обращение сразу падает, а не уходит в ленивую загрузку
+    .options(selectinload(ApprovalQueue.user), raiseload("*"))
+    .order_by(ApprovalQueue.id)
+    .limit(bindparam("limit"))
+)
 
 
 class ApprovalRepository:
@@ -12,18 +36,18 @@ class ApprovalRepository:
 
 
     async def get_by_id(self, approval_id: int) -> Optional[ApprovalQueue]:
-        q = select(ApprovalQueue).where(ApprovalQueue.id == approval_id) 
-        res = await self.db.execute(q)
+        res = await self.db.execute(GET_BY_ID_STMT, {"approval_id": approval_id})
         return res.scalars().first()
     
 
-    async def list_pending_by_faculty(self, faculty_id: int, limit: int = 50, offset: int = 0) -> List[ApprovalQueue]:
-        q = (select(ApprovalQueue)
-        .join(ApprovalQueue.user)
-        .where(ApprovalQueue.status == "pending", ApprovalQueue.user.has(faculty_id=faculty_id))
-        .limit(limit).offset(offset)
+    async def list_pending_by_faculty(
+        self, faculty_id: int, after_id: Optional[int] = None, limit: int = 50
+    ) -> List[ApprovalQueue]:
+        # Для следующей страницы передаётся id последней заявки предыдущей
+        res = await self.db.execute(
+            PENDING_BY_FACULTY_STMT,
+            {"faculty_id": faculty_id, "after_id": after_id or 0, "limit": limit},
         )
-        res = await self.db.execute(q)
         return res.scalars().all()
     
    
\ No newline at end of file
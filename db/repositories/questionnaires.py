@@ -1,30 +1,37 @@
 from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, insert, select
+from sqlalchemy.orm import undefer_group
 
 from db.models import Questionnaire
 
+# Запросы собираются один раз при импорте; параметры передаются через bindparam
+GET_BY_ID_STMT = (
+    select(Questionnaire)
+    .where(Questionnaire.id == bindparam("questionnaire_id"))
+    .options(undefer_group('payload'))
+)
+
 
 class QuestionnaireRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
     async def get_by_id(self, questionnaire_id: int) -> Optional[Questionnaire]:
-        q = select(Questionnaire).where(Questionnaire.id == questionnaire_id)
-        res = await self.db.execute(q)
+        res = await self.db.execute(GET_BY_ID_STMT, {"questionnaire_id": questionnaire_id})
         return res.scalars().first()
 
+    # Без commit: см. UserRepository
+
     async def create(self, **kwargs) -> Questionnaire:
-        qobj = Questionnaire(**kwargs)
-        self.db.add(qobj)
-        await self.db.commit()
-        await self.db.refresh(qobj)
-        return qobj
+        # Одним INSERT ... RETURNING, без отдельного SELECT после вставки
+        return await self.db.scalar(insert(Questionnaire).values(**kwargs).returning(Questionnaire))
 
-    async def update(self, questionnaire: Questionnaire, **kwargs) -> Questionnaire:
+    async def update(self, questionnaire: Questionnaire, refresh_after: bool = False, **kwargs) -> Questionnaire:
         for k, v in kwargs.items():
             setattr(questionnaire, k, v)
-        await self.db.commit()
-        await self.db.refresh(questionnaire)
+        await self.db.flush()
+        if refresh_after:
+            await self.db.refresh(questionnaire)
         return questionnaire
@@ -1,35 +1,114 @@
+import asyncio
+import logging
 from typing import Optional
 
+import redis.asyncio as redis
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, event, insert, select
 
+from app.services.user_cache import CachedUser, UserCache
 from db.models import User
 
+# Запросы собираются один раз при импорте; параметры передаются через bindparam
+GET_BY_TELEGRAM_STMT = select(User).where(User.telegram_id == bindparam("telegram_id"))
+
+logger = logging.getLogger(__name__)
+
+# Фоновые сбросы кэша после commit (ссылки держим, чтобы задачи не собрал GC)
+_invalidation_tasks: set[asyncio.Task] = set()
+
+# Ключ в session.info: (UserCache, telegram_id для сброса после commit).
+# Кэш сбрасывается только после commit: до него параллельный читатель
+# положил бы в кэш старую строку, а после отката сбрасывать нечего
+STALE_USERS_KEY = "stale_user_cache"
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_stale_users(session: Session) -> None:
+    stale = session.info.pop(STALE_USERS_KEY, None)
+    if stale is None:
+        return
+    cache, telegram_ids = stale
+    # Хук синхронный: сам сброс уходит задачей в event loop
+    task = asyncio.get_running_loop().create_task(_invalidate(cache, telegram_ids))
+    _invalidation_tasks.add(task)
+    task.add_done_callback(_invalidation_tasks.discard)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_stale_users(session: Session, previous_transaction) -> None:
+    session.info.pop(STALE_USERS_KEY, None)
+
+
+async def _invalidate(cache: UserCache, telegram_ids: set[int]) -> None:
+    try:
+        for telegram_id in telegram_ids:
+            await cache.invalidate(telegram_id)
+    except redis.RedisError as e:
+        logger.warning(f"Не удалось сбросить кэш пользователей {telegram_ids}: {e}")
+
 
 class UserRepository:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, redis_client: redis.Redis | None = None):
         self.db = db
+        # Без Redis кэш пользователей не используется
+        self.cache = UserCache(redis_client) if redis_client is not None else None
+        # telegram_id -> User в пределах сессии (запроса); по id кэширует identity map сессии
+        self._by_tg: dict[int, User] = {}
 
     async def get_by_id(self, user_id: int) -> Optional[User]:
-        q = select(User).where(User.id == user_id)
-        res = await self.db.execute(q)
-        return res.scalars().first()
+        # session.get не ходит в БД, если объект уже загружен в этой сессии
+        return await self.db.get(User, user_id)
 
     async def get_by_telegram(self, telegram_id: int) -> Optional[User]:
-        q = select(User).where(User.telegram_id == telegram_id)
-        res = await self.db.execute(q)
-        return res.scalars().first()
+        user = self._by_tg.get(telegram_id)
+        if user is not None:
+            return user
+        res = await self.db.execute(GET_BY_TELEGRAM_STMT, {"telegram_id": telegram_id})
+        user = res.scalar_one_or_none()
+        if user is not None:
+            self._by_tg[telegram_id] = user
+        return user
+
+    async def get_cached_by_telegram(self, telegram_id: int) -> Optional[CachedUser]:
+        """Краткие данные пользователя для проверок: из Redis, при промахе — из БД.
+        Для изменения пользователя нужен ORM-объект — get_by_telegram."""
+        if self.cache is not None:
+            cached = await self.cache.get(telegram_id)
+            if cached is not None:
+                return cached
+        user = await self.get_by_telegram(telegram_id)
+        if user is None:
+            return None
+        if self.cache is not None:
+            return await self.cache.set(user)
+        return CachedUser.from_user(user)
+
+    # Репозитории не коммитят: изменения уходят в БД через flush,
+    # а commit делает get_db один раз в конце запроса.
+    # create — INSERT ... RETURNING: id и server_default-поля приходят тем же запросом.
+    # refresh_after=True в update — если нужны значения, выставленные сервером
 
     async def create(self, **kwargs) -> User:
-        user = User(**kwargs)
-        self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
+        user = await self.db.scalar(insert(User).values(**kwargs).returning(User))
+        if user.telegram_id is not None:
+            self._by_tg[user.telegram_id] = user
         return user
 
-    async def update(self, user: User, **kwargs) -> User:
+    async def update(self, user: User, refresh_after: bool = False, **kwargs) -> User:
+        old_telegram_id = user.telegram_id
         for k, v in kwargs.items():
             setattr(user, k, v)
-        await self.db.commit()
-        await self.db.refresh(user)
+        await self.db.flush()
+        if refresh_after:
+            await self.db.refresh(user)
+        if old_telegram_id != user.telegram_id:
+            self._by_tg.pop(old_telegram_id, None)
+            if user.telegram_id is not None:
+                self._by_tg[user.telegram_id] = user
+        # Запись в кэше устареет после commit (в т.ч. под прежним telegram_id)
+        if self.cache is not None:
+            _, stale = self.db.info.setdefault(STALE_USERS_KEY, (self.cache, set()))
+            stale |= {old_telegram_id, user.telegram_id} - {None}
         return user
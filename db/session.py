@@ -6,6 +6,17 @@ from db.engine import async_session_maker
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """FastAPI dependency. Yields an async DB session and ensures it's closed."""
+    """
+    FastAPI dependency. Yields an async DB session and ensures it's closed.
+
+    Unit of work: изменения, накопленные через flush (репозитории), коммитятся
+    одним commit в конце запроса, при исключении — откатываются. Явный commit
+    в обработчике по-прежнему допустим: финальный commit тогда ничего не делает.
+    """
     async with async_session_maker() as session:
-        yield session
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
@@ -0,0 +1,49 @@
+"""add_active_partial_indexes
+
+Revision ID: d1e2f3a4b5c6
+Revises: c0d1e2f3a4b5
+Create Date: 2026-10-16 15:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1e2f3a4b5c6'
+down_revision: Union[str, Sequence[str], None] = 'c0d1e2f3a4b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Частичные индексы хранят только «живые» строки: активные шаблоны и слоты,
+    # заявки в статусе PENDING (SQLEnum хранит имена членов enum)
+    op.create_index(
+        'ix_templates_active',
+        'stage_templates',
+        ['faculty_id', 'stage_type'],
+        postgresql_where=sa.text('is_active'),
+    )
+    op.create_index(
+        'ix_approval_pending',
+        'approval_queue',
+        ['faculty_id', 'submitted_at'],
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+    op.create_index(
+        'ix_timeslot_active',
+        'time_slots',
+        ['day_id', 'time'],
+        postgresql_where=sa.text('is_active'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_timeslot_active', table_name='time_slots')
+    op.drop_index('ix_approval_pending', table_name='approval_queue')
+    op.drop_index('ix_templates_active', table_name='stage_templates')
@@ -0,0 +1,34 @@
+"""add_administrators_faculty_role_index
+
+Revision ID: d5e6f7a8b9c0
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-16 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e6f7a8b9c0'
+down_revision: Union[str, Sequence[str], None] = 'c4d5e6f7a8b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Списки админов/проверяющих факультета: WHERE faculty_id = ? AND role = ? AND is_active
+    # (поиск по telegram_id уже обслуживает уникальный индекс)
+    op.create_index(
+        'ix_admin_fac_role_active',
+        'administrators',
+        ['faculty_id', 'role', 'is_active'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_admin_fac_role_active', table_name='administrators')
@@ -0,0 +1,32 @@
+"""add_approval_pending_list_indexes
+
+Revision ID: c6d7e8f9a0b1
+Revises: b5c6d7e8f9a0
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6d7e8f9a0b1'
+down_revision: Union[str, Sequence[str], None] = 'b5c6d7e8f9a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (faculty_id, id) вместо (faculty_id): id пользователей факультета читаются
+    # только из индекса, а всё, что использовал старый индекс, покрывается префиксом
+    op.create_index('ix_users_faculty_id', 'users', ['faculty_id', 'id'])
+    op.drop_index('ix_users_faculty', table_name='users')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_users_faculty', 'users', ['faculty_id'])
+    op.drop_index('ix_users_faculty_id', table_name='users')
@@ -0,0 +1,35 @@
+"""add_broadcast_lookup_indexes
+
+Revision ID: f7a8b9c0d1e2
+Revises: e6f7a8b9c0d1
+Create Date: 2026-10-16 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a8b9c0d1e2'
+down_revision: Union[str, Sequence[str], None] = 'e6f7a8b9c0d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Рассылка по этапу: users (faculty_id) JOIN user_progress (stage_type, status)
+    op.create_index('ix_users_faculty', 'users', ['faculty_id'])
+    op.create_index(
+        'ix_progress_stage_status_user',
+        'user_progress',
+        ['stage_type', 'status', 'user_id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_progress_stage_status_user', table_name='user_progress')
+    op.drop_index('ix_users_faculty', table_name='users')
@@ -0,0 +1,35 @@
+"""add_interview_faculty_status_covering_index
+
+Revision ID: e2f3a4b5c6d7
+Revises: d1e2f3a4b5c6
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f3a4b5c6d7'
+down_revision: Union[str, Sequence[str], None] = 'd1e2f3a4b5c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Отчёты по собеседованиям факультета: WHERE faculty_id = ? AND status = ?
+    # score/completed_at/interviewer_id лежат в индексе (INCLUDE, PostgreSQL 11+)
+    op.create_index(
+        'ix_interview_faculty_status_covering',
+        'interviews',
+        ['faculty_id', 'status'],
+        postgresql_include=['score', 'completed_at', 'interviewer_id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_interview_faculty_status_covering', table_name='interviews')
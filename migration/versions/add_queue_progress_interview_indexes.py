@@ -0,0 +1,45 @@
+"""add_queue_progress_interview_indexes
+
+Revision ID: b9c0d1e2f3a4
+Revises: a8b9c0d1e2f3
+Create Date: 2026-10-16 14:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9c0d1e2f3a4'
+down_revision: Union[str, Sequence[str], None] = 'a8b9c0d1e2f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Очередь проверки факультета, отсортированная по времени отправки
+    op.create_index(
+        'ix_approval_faculty_status_submitted',
+        'approval_queue',
+        ['faculty_id', 'status', 'submitted_at'],
+    )
+    # Статистика прогресса по факультету и этапу
+    op.create_index(
+        'ix_progress_faculty_stage_status',
+        'user_progress',
+        ['faculty_id', 'stage_type', 'status'],
+    )
+    # Подсчёт занятости слотов и выборка записей по временным слотам
+    op.create_index('ix_interview_slot_status', 'interviews', ['slot_id', 'status'])
+    op.create_index('ix_interview_time_slot', 'interviews', ['time_slot_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_interview_time_slot', table_name='interviews')
+    op.drop_index('ix_interview_slot_status', table_name='interviews')
+    op.drop_index('ix_progress_faculty_stage_status', table_name='user_progress')
+    op.drop_index('ix_approval_faculty_status_submitted', table_name='approval_queue')
@@ -0,0 +1,44 @@
+"""add_stage_templates_active_index
+
+Revision ID: c4d5e6f7a8b9
+Revises: f7g8h9i0j1k2
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d5e6f7a8b9'
+down_revision: Union[str, Sequence[str], None] = 'f7g8h9i0j1k2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Частичный индекс для поиска активного шаблона анкеты факультета
+    # (CONCURRENTLY нельзя выполнять внутри транзакции)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_stage_templates_active_questionnaire',
+            'stage_templates',
+            ['faculty_id'],
+            postgresql_where=sa.text("stage_type = 'QUESTIONNAIRE' AND is_active"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_stage_templates_active_questionnaire',
+            table_name='stage_templates',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
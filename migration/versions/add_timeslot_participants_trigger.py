@@ -0,0 +1,76 @@
+"""add_timeslot_participants_trigger
+
+Revision ID: f3a4b5c6d7e8
+Revises: e2f3a4b5c6d7
+Create Date: 2026-10-16 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a4b5c6d7e8'
+down_revision: Union[str, Sequence[str], None] = 'e2f3a4b5c6d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # time_slots.current_participants = число неотменённых собеседований в слоте.
+    # Счётчик ведёт триггер, поэтому проверка мест — чтение одной строки, без COUNT(*)
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_timeslot_counter() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                IF OLD.time_slot_id IS NOT NULL AND OLD.status <> 'CANCELLED' THEN
+                    UPDATE time_slots
+                    SET current_participants = current_participants - 1
+                    WHERE id = OLD.time_slot_id;
+                END IF;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                IF NEW.time_slot_id IS NOT NULL AND NEW.status <> 'CANCELLED' THEN
+                    UPDATE time_slots
+                    SET current_participants = current_participants + 1
+                    WHERE id = NEW.time_slot_id;
+                END IF;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_interviews_timeslot_counter
+        AFTER INSERT OR DELETE OR UPDATE OF time_slot_id, status ON interviews
+        FOR EACH ROW EXECUTE FUNCTION bump_timeslot_counter()
+        """
+    )
+    # Пересчитываем счётчики по уже существующим записям
+    op.execute(
+        """
+        UPDATE time_slots ts
+        SET current_participants = (
+            SELECT count(*) FROM interviews i
+            WHERE i.time_slot_id = ts.id AND i.status <> 'CANCELLED'
+        )
+        """
+    )
+    # NOT VALID: старые строки не проверяются, новые записи — проверяются
+    op.execute(
+        "ALTER TABLE time_slots ADD CONSTRAINT ck_timeslot_capacity "
+        "CHECK (current_participants <= max_participants) NOT VALID"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('ck_timeslot_capacity', 'time_slots', type_='check')
+    op.execute("DROP TRIGGER IF EXISTS trg_interviews_timeslot_counter ON interviews")
+    op.execute("DROP FUNCTION IF EXISTS bump_timeslot_counter()")
@@ -0,0 +1,47 @@
+"""add_timestamp_brin_indexes
+
+Revision ID: b5c6d7e8f9a0
+Revises: a4b5c6d7e8f9
+Create Date: 2026-10-16 17:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5c6d7e8f9a0'
+down_revision: Union[str, Sequence[str], None] = 'a4b5c6d7e8f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (индекс, таблица, колонка): время вставки растёт вместе с физическим порядком строк
+BRIN_INDEXES = [
+    ('ix_questionnaires_submitted_brin', 'questionnaires', 'submitted_at'),
+    ('ix_home_videos_submitted_brin', 'home_videos', 'submitted_at'),
+    ('ix_interviews_created_brin', 'interviews', 'created_at'),
+    ('ix_approval_submitted_brin', 'approval_queue', 'submitted_at'),
+    ('ix_admin_action_logs_created_brin', 'admin_action_logs', 'created_at'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # BRIN — несколько страниц вместо B-tree на всю таблицу; для диапазонов по датам хватает
+    for name, table, column in BRIN_INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(BRIN_INDEXES):
+        op.drop_index(name, table_name=table)
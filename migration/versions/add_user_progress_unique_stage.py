@@ -0,0 +1,43 @@
+"""add_user_progress_unique_stage
+
+Revision ID: e6f7a8b9c0d1
+Revises: d5e6f7a8b9c0
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f7a8b9c0d1'
+down_revision: Union[str, Sequence[str], None] = 'd5e6f7a8b9c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Дубликаты (user_id, stage_type) могли появиться при параллельных отправках —
+    # оставляем самую свежую запись
+    op.execute(
+        """
+        DELETE FROM user_progress a
+        USING user_progress b
+        WHERE a.user_id = b.user_id
+          AND a.stage_type = b.stage_type
+          AND a.id < b.id
+        """
+    )
+    op.create_unique_constraint(
+        'uq_user_progress_user_stage',
+        'user_progress',
+        ['user_id', 'stage_type'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_user_progress_user_stage', 'user_progress', type_='unique')
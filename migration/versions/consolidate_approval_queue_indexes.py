@@ -0,0 +1,58 @@
+"""consolidate_approval_queue_indexes
+
+Revision ID: d7e8f9a0b1c2
+Revises: c6d7e8f9a0b1
+Create Date: 2026-10-16 18:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7e8f9a0b1c2'
+down_revision: Union[str, Sequence[str], None] = 'c6d7e8f9a0b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Все запросы к очереди выбирают заявки в статусе PENDING (SQLEnum хранит имя):
+    # list_pending_by_faculty — WHERE faculty_id = ? AND id > ? ORDER BY id,
+    # счётчик и список в боте — только по статусу. Одного частичного индекса хватает всем
+    op.create_index(
+        'ix_approval_pending_faculty_id',
+        'approval_queue',
+        ['faculty_id', 'id'],
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+    # Прежние индексы очереди ни одним запросом не используются
+    op.drop_index('ix_approval_pending', table_name='approval_queue')
+    op.drop_index('ix_approval_faculty_status_submitted', table_name='approval_queue')
+    op.drop_index('ix_approval_submitted_brin', table_name='approval_queue')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        'ix_approval_submitted_brin',
+        'approval_queue',
+        ['submitted_at'],
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 32},
+    )
+    op.create_index(
+        'ix_approval_faculty_status_submitted',
+        'approval_queue',
+        ['faculty_id', 'status', 'submitted_at'],
+    )
+    op.create_index(
+        'ix_approval_pending',
+        'approval_queue',
+        ['faculty_id', 'submitted_at'],
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+    op.drop_index('ix_approval_pending_faculty_id', table_name='approval_queue')
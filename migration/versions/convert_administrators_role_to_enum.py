@@ -0,0 +1,49 @@
+"""convert_administrators_role_to_enum
+
+Revision ID: c0d1e2f3a4b5
+Revises: b9c0d1e2f3a4
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c0d1e2f3a4b5'
+down_revision: Union[str, Sequence[str], None] = 'b9c0d1e2f3a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+adminrole = postgresql.ENUM('HEAD_ADMIN', 'REVIEWER', name='adminrole')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLEnum хранит имена членов enum: 'head_admin' -> 'HEAD_ADMIN'
+    adminrole.create(op.get_bind(), checkfirst=True)
+    op.alter_column(
+        'administrators',
+        'role',
+        type_=adminrole,
+        existing_type=sa.String(length=30),
+        existing_nullable=False,
+        postgresql_using='upper(role)::adminrole',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'administrators',
+        'role',
+        type_=sa.String(length=30),
+        existing_type=adminrole,
+        existing_nullable=False,
+        postgresql_using='lower(role::text)',
+    )
+    adminrole.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,55 @@
+"""convert_json_columns_to_jsonb
+
+Revision ID: a8b9c0d1e2f3
+Revises: f7a8b9c0d1e2
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8b9c0d1e2f3'
+down_revision: Union[str, Sequence[str], None] = 'f7a8b9c0d1e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (таблица, колонка, nullable)
+JSON_COLUMNS = [
+    ('stage_templates', 'questions', False),
+    ('questionnaires', 'answers', False),
+    ('approval_queue', 'answers', False),
+    ('admin_action_logs', 'details', True),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # JSONB хранится в разобранном бинарном виде: без повторного парсинга текста при чтении
+    for table, column, nullable in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            existing_nullable=nullable,
+            postgresql_using=f'{column}::jsonb',
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column, nullable in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            existing_nullable=nullable,
+            postgresql_using=f'{column}::json',
+        )
@@ -0,0 +1,49 @@
+"""replace_active_template_index
+
+Revision ID: a4b5c6d7e8f9
+Revises: f3a4b5c6d7e8
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4b5c6d7e8f9'
+down_revision: Union[str, Sequence[str], None] = 'f3a4b5c6d7e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Текущий шаблон: ORDER BY version DESC LIMIT 1 читается из индекса без сортировки.
+    # Новый индекс покрывает и оба прежних (анкета — частный случай stage_type)
+    op.drop_index('ix_templates_active', table_name='stage_templates')
+    op.drop_index('ix_stage_templates_active_questionnaire', table_name='stage_templates')
+    op.create_index(
+        'ix_active_template',
+        'stage_templates',
+        ['faculty_id', 'stage_type', 'version'],
+        postgresql_where=sa.text('is_active'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_active_template', table_name='stage_templates')
+    op.create_index(
+        'ix_stage_templates_active_questionnaire',
+        'stage_templates',
+        ['faculty_id'],
+        postgresql_where=sa.text("stage_type = 'QUESTIONNAIRE' AND is_active"),
+    )
+    op.create_index(
+        'ix_templates_active',
+        'stage_templates',
+        ['faculty_id', 'stage_type'],
+        postgresql_where=sa.text('is_active'),
+    )
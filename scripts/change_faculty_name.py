@@ -12,6 +12,7 @@ import asyncio
 # Добавляем корень проекта в путь
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from bot.cache import close_redis, invalidate_faculties_cache
 from db.session import async_session_maker
 from db.models import Faculty
 from sqlalchemy import select
@@ -20,18 +21,21 @@ from sqlalchemy import select
 async def list_faculties():
     """Показать список всех факультетов"""
     async with async_session_maker() as db:
-        result = await db.execute(select(Faculty).order_by(Faculty.id))
-        faculties = result.scalars().all()
+        # Строки читаются серверным курсором и печатаются по мере получения
+        result = await db.stream(select(Faculty.id, Faculty.name).order_by(Faculty.id))
         
-        if not faculties:
+        found = False
+        async for f in result:
+            if not found:
+                print("\n📋 Список факультетов:\n")
+                print("ID | Название")
+                print("---|" + "-" * 50)
+                found = True
+            print(f"{f.id:2} | {f.name}")
+        
+        if not found:
             print("Факультеты не найдены")
             return
-        
-        print("\n📋 Список факультетов:\n")
-        print("ID | Название")
-        print("---|" + "-" * 50)
-        for f in faculties:
-            print(f"{f.id:2} | {f.name}")
         print()
 
 
@@ -39,8 +43,7 @@ async def update_faculty(faculty_id: int, new_name: str):
     """Изменить название факультета"""
     async with async_session_maker() as db:
         # Получаем факультет
-        result = await db.execute(select(Faculty).where(Faculty.id == faculty_id))
-        faculty = result.scalars().first()
+        faculty = await db.get(Faculty, faculty_id)
         
         if not faculty:
             print(f"❌ Факультет с ID={faculty_id} не найден!")
@@ -53,13 +56,16 @@ async def update_faculty(faculty_id: int, new_name: str):
         # Изменяем название
         faculty.name = new_name
         await db.commit()
-        
-        # Выводим результат (используем сохранённые значения, не обращаемся к объекту после commit)
-        print(f"✅ Название успешно изменено!")
-        print(f"   ID: {faculty_id_value}")
-        print(f"   Было: {old_name}")
-        print(f"   Стало: {new_name}")
-        return True
+    
+    # Кэш списка факультетов (бот, кнопки выбора) — иначе старое название живёт до TTL
+    await invalidate_faculties_cache()
+    
+    # Выводим результат (используем сохранённые значения, сессия уже закрыта)
+    print(f"✅ Название успешно изменено!")
+    print(f"   ID: {faculty_id_value}")
+    print(f"   Было: {old_name}")
+    print(f"   Стало: {new_name}")
+    return True
 
 
 async def main():
@@ -82,7 +88,10 @@ async def main():
                 sys.exit(1)
             
             new_name = sys.argv[2]
-            await update_faculty(faculty_id, new_name)
+            try:
+                await update_faculty(faculty_id, new_name)
+            finally:
+                await close_redis()
         except ValueError:
             print(f"❌ Неверный ID факультета: {sys.argv[1]}")
             sys.exit(1)
@@ -6,7 +6,8 @@ import asyncio
 import sys
 sys.path.insert(0, '.')
 
-from sqlalchemy import select
+from sqlalchemy import func, insert, select, update
+from bot.cache import close_redis, invalidate_template_cache
 from db.engine import async_session_maker
 from db.models import Faculty, StageTemplate, StageType, StageStatus
 
@@ -110,47 +111,75 @@ DEFAULT_QUESTIONS = [
 async def seed_questions():
     """Добавить дефолтные вопросы для всех факультетов"""
     async with async_session_maker() as db:
-        # Получаем все факультеты
-        result = await db.execute(select(Faculty))
-        faculties = result.scalars().all()
+        # Получаем все факультеты (для вывода нужны только id и название)
+        result = await db.execute(select(Faculty.id, Faculty.name))
+        faculties = result.all()
         
         if not faculties:
             print("❌ Нет факультетов! Сначала создайте факультет через /superadmin")
             return
         
+        # Шаблоны анкеты всех факультетов — одним запросом и без самих вопросов:
+        # для решения достаточно их количества
+        result = await db.execute(
+            select(
+                StageTemplate.faculty_id,
+                StageTemplate.id,
+                func.jsonb_array_length(StageTemplate.questions).label("questions_count"),
+            ).where(
+                StageTemplate.faculty_id.in_([f.id for f in faculties]),
+                StageTemplate.stage_type == StageType.QUESTIONNAIRE
+            )
+        )
+        templates_by_faculty = {}
+        for row in result:
+            templates_by_faculty.setdefault(row.faculty_id, row)
+        
+        empty_template_ids = []
+        rows = []
+        changed_faculty_ids = []
         for faculty in faculties:
             print(f"\n📍 Факультет: {faculty.name}")
             
             # Проверяем есть ли уже шаблон
-            result = await db.execute(
-                select(StageTemplate).where(
-                    StageTemplate.faculty_id == faculty.id,
-                    StageTemplate.stage_type == StageType.QUESTIONNAIRE
-                )
-            )
-            template = result.scalars().first()
+            template = templates_by_faculty.get(faculty.id)
             
             if template:
-                if template.questions:
-                    print(f"   ⚠️ Уже есть {len(template.questions)} вопросов, пропускаем")
+                if template.questions_count:
+                    print(f"   ⚠️ Уже есть {template.questions_count} вопросов, пропускаем")
                     continue
                 else:
-                    # Обновляем существующий шаблон
-                    template.questions = DEFAULT_QUESTIONS
+                    # Существующий пустой шаблон заполняется общим UPDATE ниже
+                    empty_template_ids.append(template.id)
+                    changed_faculty_ids.append(faculty.id)
                     print(f"   ✅ Добавлено {len(DEFAULT_QUESTIONS)} вопросов в существующий шаблон")
             else:
-                # Создаём новый шаблон
-                template = StageTemplate(
-                    faculty_id=faculty.id,
-                    stage_type=StageType.QUESTIONNAIRE,
-                    questions=DEFAULT_QUESTIONS,
-                    is_active=True
-                )
-                db.add(template)
+                # Новый шаблон — строкой для общего INSERT
+                rows.append({
+                    "faculty_id": faculty.id,
+                    "stage_type": StageType.QUESTIONNAIRE,
+                    "questions": DEFAULT_QUESTIONS,
+                    "is_active": True,
+                })
+                changed_faculty_ids.append(faculty.id)
                 print(f"   ✅ Создан шаблон с {len(DEFAULT_QUESTIONS)} вопросами")
         
+        # Не больше двух запросов на запись, сколько бы ни было факультетов
+        if empty_template_ids:
+            await db.execute(
+                update(StageTemplate)
+                .where(StageTemplate.id.in_(empty_template_ids))
+                .values(questions=DEFAULT_QUESTIONS)
+            )
+        if rows:
+            await db.execute(insert(StageTemplate), rows)
+        
         await db.commit()
-        print("\n✅ Готово!")
+    
+    # API держит шаблоны в кэше Redis — сбрасываем у изменённых факультетов
+    for faculty_id in changed_faculty_ids:
+        await invalidate_template_cache(faculty_id)
+    print("\n✅ Готово!")
 
 
 async def open_questionnaire_stage():
@@ -170,11 +199,14 @@ async def open_questionnaire_stage():
 async def main(open_stage: bool = False):
     """Главная функция"""
     print("🚀 Добавление дефолтных вопросов...")
-    await seed_questions()
-    
-    if open_stage:
-        print("\n🔓 Открытие этапа анкеты...")
-        await open_questionnaire_stage()
+    try:
+        await seed_questions()
+        
+        if open_stage:
+            print("\n🔓 Открытие этапа анкеты...")
+            await open_questionnaire_stage()
+    finally:
+        await close_redis()
 
 
 if __name__ == "__main__":
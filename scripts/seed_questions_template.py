@@ -59,9 +59,10 @@ from pathlib import Path
 # Добавляем корневую директорию в путь
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy import select
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from bot.cache import close_redis, invalidate_template_cache
 from db.engine import async_session_maker
 from db.models import Faculty, StageTemplate, StageType
 
@@ -101,6 +102,8 @@ async def seed_questions_to_all_faculties(
         faculty_ids: Список ID факультетов (None = все факультеты)
     """
     async with async_session_maker() as db:
+        # Все изменения уходят двумя явными запросами в конце — автосброс не нужен
+        db.autoflush = False
         # Получаем список факультетов
         if faculty_ids:
             query = select(Faculty).where(Faculty.id.in_(faculty_ids))
@@ -121,20 +124,28 @@ async def seed_questions_to_all_faculties(
         created_count = 0
         updated_count = 0
         
+        # Активные шаблоны всех выбранных факультетов — одним запросом
+        result = await db.execute(
+            select(StageTemplate).where(
+                StageTemplate.faculty_id.in_([f.id for f in faculties]),
+                StageTemplate.stage_type == stage_type,
+                StageTemplate.is_active == True
+            )
+        )
+        active_by_faculty = {}
+        deactivate_ids = []
+        for template in result.scalars():
+            active_by_faculty.setdefault(template.faculty_id, template)
+            deactivate_ids.append(template.id)
+        
+        rows = []
+        
         for faculty in faculties:
             # Проверяем, есть ли уже активный шаблон для этого этапа
-            result = await db.execute(
-                select(StageTemplate).where(
-                    StageTemplate.faculty_id == faculty.id,
-                    StageTemplate.stage_type == stage_type,
-                    StageTemplate.is_active == True
-                )
-            )
-            existing_template = result.scalars().first()
+            existing_template = active_by_faculty.get(faculty.id)
             
             if existing_template:
-                # Деактивируем старый шаблон
-                existing_template.is_active = False
+                # Старый шаблон деактивируется общим UPDATE ниже
                 # Создаём новый с увеличенной версией
                 new_version = existing_template.version + 1
                 print(f"  🔄 Факультет '{faculty.name}': обновление шаблона (v{existing_template.version} -> v{new_version})")
@@ -142,24 +153,36 @@ async def seed_questions_to_all_faculties(
                 new_version = 1
                 print(f"  ✨ Факультет '{faculty.name}': создание нового шаблона")
             
-            # Создаём новый шаблон
-            new_template = StageTemplate(
-                faculty_id=faculty.id,
-                stage_type=stage_type,
-                version=new_version,
-                questions=questions,
-                is_active=True,
-                created_by=None  # Системное добавление
-            )
-            db.add(new_template)
+            # Новый шаблон — строкой для общего INSERT
+            rows.append({
+                "faculty_id": faculty.id,
+                "stage_type": stage_type,
+                "version": new_version,
+                "questions": questions,
+                "is_active": True,
+                "created_by": None,  # Системное добавление
+            })
             
             if existing_template:
                 updated_count += 1
             else:
                 created_count += 1
         
+        # Два запроса на все факультеты: деактивация старых и пакетная вставка новых
+        if deactivate_ids:
+            await db.execute(
+                update(StageTemplate)
+                .where(StageTemplate.id.in_(deactivate_ids))
+                .values(is_active=False)
+            )
+        await db.execute(insert(StageTemplate), rows)
         await db.commit()
         
+        # API держит активный шаблон анкеты в кэше Redis — сбрасываем у всех затронутых
+        if stage_type == StageType.QUESTIONNAIRE:
+            for faculty in faculties:
+                await invalidate_template_cache(faculty.id)
+        
         print()
         print(f"✅ Готово!")
         print(f"   Создано новых шаблонов: {created_count}")
@@ -203,7 +226,10 @@ async def main():
         sys.exit(0)
     
     # Добавляем вопросы
-    await seed_questions_to_all_faculties(questions)
+    try:
+        await seed_questions_to_all_faculties(questions)
+    finally:
+        await close_redis()
     
     print()
     print("🎉 Вопросы успешно добавлены!")
@@ -1,26 +1,20 @@
+from itertools import accumulate, repeat
+
 n = int(input())
 path = input().strip()
 
-x = y = 0
-visited = {(0, 0)}
-
-for move in path:
-    if move == 'L':
-        x -= 1
-    elif move == 'R':
-        x += 1
-    elif move == 'U':
-        y += 1
-    elif move == 'D':
-        y -= 1
+# Точка (x, y) упакована в одно целое x * WIDTH + y: |y| <= len(path) < WIDTH / 2,
+# поэтому упаковка однозначна, а хэш int дешевле хэша кортежа или complex
+WIDTH = 2 * len(path) + 1
+MOVES = {'L': -WIDTH, 'R': WIDTH, 'U': 1, 'D': -1}
 
-    if (x, y) in visited:
+# Позиции (вместе со стартовой) — префиксные суммы шагов, считаются на уровне C;
+# цикл только проверяет повтор и выходит на первом. Неизвестный символ — шаг на месте
+visited = set()
+for position in accumulate(map(MOVES.get, path, repeat(0)), initial=0):
+    if position in visited:
         print("YES")
         break
-
-    visited.add((x, y))
+    visited.add(position)
 else:
     print("NO")
-
-
-
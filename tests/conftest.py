@@ -0,0 +1,46 @@
+"""
+Общие фикстуры тестов.
+
+Тесты API идут в приложение через ASGI, но с настоящими PostgreSQL и Redis
+из настроек (.env, ENV=dev) — так считаются реальные запросы к БД.
+"""
+import pytest
+import pytest_asyncio
+import redis.asyncio as redis
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import exc as sa_exc
+
+from app.core.redis import redis_client
+from app.main import app
+from db.engine import engine
+from db.query_counter import count_queries
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Бюджет запросов к БД: with assert_max_queries(3): ...
+    Тест падает, если внутри блока выполнено больше n запросов (защита от N+1).
+    """
+    return lambda n: count_queries(max_queries=n)
+
+
+@pytest_asyncio.fixture
+async def client():
+    """HTTP-клиент к приложению; без PostgreSQL или Redis тест пропускается"""
+    try:
+        async with engine.connect():
+            pass
+        await redis_client.connect()
+        await redis_client.client.ping()
+    except (OSError, sa_exc.DBAPIError, redis.RedisError) as e:
+        await engine.dispose()
+        pytest.skip(f"PostgreSQL или Redis недоступны: {e}")
+
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+            yield c
+    finally:
+        await redis_client.disconnect()
+        # Соединения пула привязаны к event loop теста
+        await engine.dispose()
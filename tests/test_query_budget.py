@@ -0,0 +1,50 @@
+"""
+Бюджеты запросов к БД для эндпоинтов API.
+Если после изменения эндпоинт стал делать больше запросов — это почти всегда N+1.
+"""
+import pytest
+import pytest_asyncio
+
+from config import settings
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def dev_faculty_id(client):
+    """Тестовые факультет, пользователь и шаблон анкеты (dev-эндпоинт)"""
+    if not settings.is_dev:
+        pytest.skip("Нужен ENV=dev")
+    response = await client.post("/api/v1/questionnaire/dev/seed")
+    assert response.status_code == 200
+    return response.json()["faculty_id"]
+
+
+async def test_questionnaire_status_query_budget(client, dev_faculty_id, assert_max_queries):
+    # Прогрев кэша пользователя: дальше он читается из Redis, а не из БД
+    await client.get(
+        f"/api/v1/questionnaire/{dev_faculty_id}/status",
+        params={"telegram_id": settings.dev_telegram_id},
+    )
+    # Факультет и прогресс — по одному запросу
+    with assert_max_queries(2):
+        response = await client.get(
+            f"/api/v1/questionnaire/{dev_faculty_id}/status",
+            params={"telegram_id": settings.dev_telegram_id},
+        )
+    assert response.status_code == 200
+
+
+async def test_questionnaire_with_template_query_budget(client, dev_faculty_id, assert_max_queries):
+    # Прогрев кэшей шаблона и пользователя: дальше они читаются из Redis, а не из БД
+    await client.get(
+        f"/api/v1/questionnaire/{dev_faculty_id}",
+        params={"telegram_id": settings.dev_telegram_id},
+    )
+    # Факультет и отправленная анкета — по одному запросу
+    with assert_max_queries(2):
+        response = await client.get(
+            f"/api/v1/questionnaire/{dev_faculty_id}",
+            params={"telegram_id": settings.dev_telegram_id},
+        )
+    assert response.status_code == 200